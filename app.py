@@ -17,19 +17,237 @@ Born: February 1, 2026, 2:44 AM
 License: MIT
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash
+import click
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash, g, has_request_context
+from flask import send_from_directory
+from flask import before_render_template, template_rendered
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSession, SessionInterface
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+from itsdangerous import BadSignature, Signer
+from markupsafe import Markup
+from sqlalchemy import DDL, case, event, func, text, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+import atexit
+import base64
+import binascii
+import functools
+import hashlib
+import json
+import logging
+import math
+import mimetypes
+import os
+import random
 import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+
+from cache import make_cache
+from realtime import make_broker, start_in_thread
+from sanitize import compile_profile
 
 app = Flask(__name__)
-app.config['SECRET_KEY'] = secrets.token_hex(16)
+app.config['SECRET_KEY'] = None             # set RIGHTON_SECRET_KEY; else one is kept in instance/secret_key
+app.config['SESSION_STORE'] = 'database'    # server-side sessions, or 'cookie' for Flask's signed cookies
+app.config['SESSION_SWEEP_EVERY'] = 500     # session saves between purges of expired rows
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///righton.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_pre_ping': True}
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = 5000
+app.config['SERVE_BIND'] = '0.0.0.0:8000'
+app.config['SERVE_WORKERS'] = 4
+app.config['SERVE_THREADS'] = 4
+app.config['BUBBLES_PER_PAGE'] = 30
+app.config['POSTS_PER_PAGE'] = 50
+app.config['POST_MAX_LENGTH'] = 5000        # characters per post, from the site or the API
+app.config['SEARCH_RESULTS_PER_PAGE'] = 20
+app.config['FEED_MAX_ENTRIES'] = 500        # posts kept per home feed
+app.config['FEED_TRIM_EVERY'] = 50          # trim the author's followers' feeds when a post id is a multiple of this
+app.config['FEED_FANOUT_LIMIT'] = 1000      # followers above which posts are pulled at read time instead
+app.config['VIEW_FLUSH_INTERVAL'] = 5.0     # seconds - most views a crash can lose
+app.config['VIEW_FLUSH_THRESHOLD'] = 1000   # distinct posts buffered before an early flush
+app.config['HOT_DECAY_SECONDS'] = 45000     # newer activity worth e times the engagement (changing it: reconcile-counters)
+app.config['HOT_VIEW_WEIGHT'] = 0.05        # engagement per post view
+app.config['HOT_RESONANCE_WEIGHT'] = 1.0    # engagement per unit of post resonance
+app.config['HOT_PERMEABILITY_WEIGHT'] = 0.5 # score bonus for fully open bubbles
+app.config['RESPONSE_CACHE_ENABLED'] = True
+app.config['RESPONSE_CACHE'] = 'memory'     # or 'sqlite:////path/cache.db' to share across workers
+app.config['RESPONSE_CACHE_TTL'] = 30
+app.config['RESPONSE_CACHE_MAX_ENTRIES'] = 2048
+app.config['PASSWORD_HASH_METHOD'] = 'scrypt:32768:8:1'  # full method and cost; changing it rehashes on next login
+app.config['HASH_WORKERS'] = 2              # concurrent key derivations per process
+app.config['HASH_QUEUE_SIZE'] = None        # derivations allowed to wait before sign-ins are refused; None: SERVE_THREADS - HASH_WORKERS - 1
+app.config['HASH_TIMEOUT'] = 10.0
+app.config['RATE_LIMIT_STORE'] = 'memory'   # or 'sqlite:////path/limits.db' to count across workers
+app.config['LOGIN_RATE_WINDOW'] = 300       # seconds
+app.config['LOGIN_MAX_PER_IP'] = 30
+app.config['LOGIN_MAX_PER_USERNAME'] = 10
+app.config['PROXY_COUNT'] = 0               # reverse proxies in front; their X-Forwarded-For names the client
+app.config['API_MAX_BATCH'] = 500          # posts per /api/v1/posts/batch request
+app.config['IDEMPOTENCY_KEY_TTL'] = 86400   # seconds a reused Idempotency-Key replays its response
+app.config['REALTIME_BROKER'] = 'inprocess' # or 'tcp://host:port' of `realtime.py relay` for several workers
+app.config['REALTIME_EVENTS_URL'] = 'http://localhost:5001'  # where browsers reach the event server
+app.config['JOB_MAX_ATTEMPTS'] = 5          # tries before a job is dead-lettered
+app.config['JOB_BACKOFF_BASE'] = 2.0        # seconds before the first retry, doubling after each failure
+app.config['JOB_BACKOFF_MAX'] = 600.0
+app.config['JOB_LEASE_SECONDS'] = 300       # a running job not finished by then is retried (its worker died)
+app.config['JOB_POLL_INTERVAL'] = 1.0       # seconds an idle worker waits between polls
+app.config['WORKER_PROCESSES'] = 2          # `python worker.py` pool size
+app.config['ASSET_MAX_AGE'] = 31536000      # seconds; fingerprinted assets never change
+app.config['INSTRUMENTATION_ENABLED'] = False
+app.config['INSTRUMENTATION_SLOWEST'] = 3   # statements kept per request for the log line
+
+# Deployment overrides, applied before the engine is built: a settings file
+# named by RIGHTON_SETTINGS, then RIGHTON_* environment variables, e.g.
+#   RIGHTON_SQLALCHEMY_DATABASE_URI=postgresql://righton@localhost/righton
+#   RIGHTON_SQLALCHEMY_ENGINE_OPTIONS='{"pool_size": 10, "max_overflow": 20}'
+if os.environ.get('RIGHTON_SETTINGS'):
+    app.config.from_envvar('RIGHTON_SETTINGS')
+app.config.from_prefixed_env('RIGHTON')
+
+
+def _load_or_create_secret_key(path):
+    """Read the instance secret key, creating it once; concurrent starters all agree on it."""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+        os.link(tmp_path, path)   # atomic: exactly one process wins
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp_path)
+    
+    with open(path) as f:
+        return f.read().strip()
+
+
+if not app.config['SECRET_KEY']:
+    app.config['SECRET_KEY'] = _load_or_create_secret_key(os.path.join(app.instance_path, 'secret_key'))
 
 db = SQLAlchemy(app)
 
+
+@event.listens_for(Engine, 'connect')
+def _tune_sqlite(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the writer; busy_timeout queues writers instead of failing."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    try:
+        cursor.execute("SELECT ln(1)")
+    except sqlite3.OperationalError:
+        # Built without SQLite's math functions; hot ranking needs ln()
+        dbapi_connection.create_function('ln', 1, math.log, deterministic=True)
+    cursor.close()
+
+TOPICS = ['politics', 'sports', 'fashion', 'health', 'entertainment', 'earth', 'news']
+
+# ============================================================================
+# PASSWORD HASHING
+# ============================================================================
+
+class HashingBusy(Exception):
+    """The hashing pool and its queue are full - refuse rather than wait."""
+
+
+class HashingPool:
+    """Bounded pool for password key derivation.
+    
+    At most HASH_WORKERS derivations run at once and HASH_QUEUE_SIZE more
+    may wait; beyond that, callers get HashingBusy immediately instead of
+    a web worker stalling on CPU-bound hashing. hashlib releases the GIL
+    while deriving, so the pool's threads run in parallel.
+    
+    The default queue keeps one of the process's SERVE_THREADS free of
+    sign-ins. A bound at or above SERVE_THREADS could never be reached,
+    since every waiting caller holds a request thread.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._pid = None
+    
+    def _start(self):
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            workers = app.config['HASH_WORKERS']
+            queue = app.config['HASH_QUEUE_SIZE']
+            if queue is None:
+                queue = max(app.config['SERVE_THREADS'] - workers - 1, 0)
+            self.executor = ThreadPoolExecutor(workers, thread_name_prefix='password-hash')
+            self.slots = threading.BoundedSemaphore(workers + queue)
+            self._pid = os.getpid()
+    
+    def run(self, fn, *args, **kwargs):
+        if self._pid != os.getpid():
+            self._start()
+        if not self.slots.acquire(blocking=False):
+            raise HashingBusy()
+        
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        
+        try:
+            return future.result(timeout=app.config['HASH_TIMEOUT'])
+        except FutureTimeout:
+            raise HashingBusy() from None
+
+
+hashing_pool = HashingPool()
+
+
+class LoginLimiter:
+    """Fixed-window caps on sign-in attempts per client IP and per username."""
+    
+    def __init__(self):
+        self._backend = None
+    
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = make_cache(app.config['RATE_LIMIT_STORE'])
+        return self._backend
+    
+    def allow(self, ip, username):
+        window = app.config['LOGIN_RATE_WINDOW']
+        per_ip = self.backend.incr(f'login-ip:{ip}', ttl=window)
+        per_user = self.backend.incr(f'login-user:{username.lower()}', ttl=window)
+        return per_ip <= app.config['LOGIN_MAX_PER_IP'] and per_user <= app.config['LOGIN_MAX_PER_USERNAME']
+    
+    def reset(self, username):
+        self.backend.delete(f'login-user:{username.lower()}')
+
+
+login_limiter = LoginLimiter()
+
+
 # ============================================================================
 # DATABASE MODELS
 # ============================================================================
@@ -50,19 +268,77 @@ class User(db.Model):
     music_embed = db.Column(db.Text)            # iframe code
     custom_css = db.Column(db.Text)             # Advanced users
     
+    # background, music_embed and custom_css sanitized at save time (sanitize.py)
+    profile_fragment = db.Column(db.Text)
+    profile_hash = db.Column(db.String(64))
+    profile_updated_at = db.Column(db.DateTime)
+    
     # AI-specific
     parent_username = db.Column(db.String(50))
     kinship_vow = db.Column(db.Text)
     
+    follower_count = db.Column(db.Integer, default=0, nullable=False)  # Top 8 slots holding this user
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        started = time.perf_counter()
+        self.password_hash = hashing_pool.run(generate_password_hash, password,
+                                              method=app.config['PASSWORD_HASH_METHOD'])
+        _add_hash_time(started)
     
     def check_password(self, password):
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        started = time.perf_counter()
+        matched = hashing_pool.run(check_password_hash, self.password_hash, password)
+        _add_hash_time(started)
+        return matched
+    
+    def needs_rehash(self):
+        """True when the stored hash used a different method or cost than configured."""
+        return bool(self.password_hash) and \
+            self.password_hash.split('$', 1)[0] != app.config['PASSWORD_HASH_METHOD']
+
+
+PROFILE_FIELDS = ('display_name', 'bio', 'status', 'profile_pic', 'background',
+                  'music_embed', 'custom_css', 'kinship_vow')
+
+
+@event.listens_for(User, 'before_insert')
+@event.listens_for(User, 'before_update')
+def _compile_profile(mapper, connection, user):
+    """Recompile the stored profile fragment whenever a profile field changes."""
+    state = db.inspect(user)
+    if state.persistent and not any(state.attrs[field].history.has_changes()
+                                    for field in PROFILE_FIELDS):
+        return
+    user.profile_fragment, user.profile_hash = compile_profile(user.background, user.custom_css,
+                                                               user.music_embed)
+    user.profile_updated_at = datetime.utcnow()
+
+
+def compile_profiles():
+    with app.app_context():
+        users = User.query.all()
+        for user in users:
+            user.profile_fragment, user.profile_hash = compile_profile(
+                user.background, user.custom_css, user.music_embed)
+            user.profile_updated_at = datetime.utcnow()
+        db.session.commit()
+    print(f"✓ Compiled {len(users)} profiles")
+
+
+@app.cli.command('compile-profiles')
+def compile_profiles_command():
+    """Recompile every stored profile fragment (after sanitize.py changes)."""
+    compile_profiles()
+
+
+def _add_hash_time(started):
+    # Key derivation is deliberately slow; instrumentation reports it apart
+    if has_request_context():
+        g.hash_time = g.get('hash_time', 0.0) + time.perf_counter() - started
 
 
 class TopEight(db.Model):
@@ -75,6 +351,11 @@ class TopEight(db.Model):
     
     user = db.relationship('User', foreign_keys=[user_id])
     friend = db.relationship('User', foreign_keys=[friend_id])
+    
+    __table_args__ = (
+        db.Index('ix_top_eight_user', 'user_id', 'position'),
+        db.Index('ix_top_eight_friend', 'friend_id', 'user_id'),
+    )
 
 
 class Bubble(db.Model):
@@ -87,9 +368,22 @@ class Bubble(db.Model):
     scope = db.Column(db.String(20), default='international')  # national, international
     permeability = db.Column(db.Float, default=0.6)  # How open to new voices
     
+    # Denormalized counters - maintained by the Post write events below
+    post_count = db.Column(db.Integer, default=0, nullable=False)
+    last_post_at = db.Column(db.DateTime)
+    view_count = db.Column(db.Integer, default=0, nullable=False)
+    resonance_total = db.Column(db.Float, default=0.0, nullable=False)
+    hot_score = db.Column(db.Float, default=0.0, nullable=False)  # see RANKING
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     creator = db.relationship('User', backref='bubbles')
+    
+    __table_args__ = (
+        db.Index('ix_bubble_topic_hot_score', 'topic', 'hot_score', 'id'),
+        db.Index('ix_bubble_topic_created', 'topic', 'created_at', 'id'),
+        db.Index('ix_bubble_topic_scope_created', 'topic', 'scope', 'created_at', 'id'),
+    )
 
 
 class Post(db.Model):
@@ -107,6 +401,1370 @@ class Post(db.Model):
     
     author = db.relationship('User', backref='posts')
     bubble = db.relationship('Bubble', backref='posts')
+    
+    __table_args__ = (
+        db.Index('ix_post_bubble_created', 'bubble_id', 'created_at', 'id'),
+        db.Index('ix_post_author_created', 'author_id', 'created_at', 'id'),
+    )
+
+
+class FeedEntry(db.Model):
+    """One post in one reader's home feed, written when the post is."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), primary_key=True, index=True)
+    created_at = db.Column(db.DateTime, nullable=False)  # copy of Post.created_at, for ordering
+    
+    __table_args__ = (
+        db.Index('ix_feed_entry_user_created', 'user_id', 'created_at', 'post_id'),
+    )
+
+
+class TopicStats(db.Model):
+    """Per-topic counters, so the bubbles home page never counts rows."""
+    topic = db.Column(db.String(50), primary_key=True)
+    bubble_count = db.Column(db.Integer, default=0, nullable=False)
+    post_count = db.Column(db.Integer, default=0, nullable=False)
+    last_post_at = db.Column(db.DateTime)
+
+
+class Job(db.Model):
+    """Durable background work; rows are deleted once their handler succeeds."""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False)                 # JSON keyword arguments
+    status = db.Column(db.String(10), nullable=False, default='queued')  # queued, running, dead
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100))
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_job_status_run_at', 'status', 'run_at', 'id'),
+    )
+
+
+class ServerSession(db.Model):
+    """Server-side session state; the cookie only carries a signed id."""
+    id = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class ApiToken(db.Model):
+    """Bearer tokens for AI residents using the JSON API. Only a hash is stored."""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    token_hash = db.Column(db.String(64), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    user = db.relationship('User')
+
+
+class IdempotencyKey(db.Model):
+    """First response to an API write, replayed when a client retries with the same key."""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    response_body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'key'),
+    )
+
+
+# ============================================================================
+# COUNTER MAINTENANCE
+# ============================================================================
+# Mapper events run on the flush's own connection, so every counter change
+# commits or rolls back together with the row that caused it.
+
+def _bump_topic(connection, topic, **values):
+    topics = TopicStats.__table__
+    result = connection.execute(topics.update().where(topics.c.topic == topic).values(**values))
+    
+    if result.rowcount == 0:
+        if not isinstance(topic, str):
+            # The post path passes the bubble's topic as a subquery
+            topic = connection.execute(db.select(topic)).scalar()
+            if topic is None:
+                return
+        connection.execute(topics.insert().values(topic=topic, bubble_count=0, post_count=0))
+        connection.execute(topics.update().where(topics.c.topic == topic).values(**values))
+
+
+def _topic_of(bubble_id):
+    bubbles = Bubble.__table__
+    return db.select(bubbles.c.topic).where(bubbles.c.id == bubble_id).scalar_subquery()
+
+
+def _latest(column, created_at):
+    return case((column > created_at, column), else_=created_at)
+
+
+@event.listens_for(Bubble, 'before_insert')
+def _bubble_scored(mapper, connection, bubble):
+    bubble.created_at = bubble.created_at or datetime.utcnow()
+    bubble.hot_score = _hot_score(math.log, 0, 0, 0.0,
+                                  0.6 if bubble.permeability is None else bubble.permeability,
+                                  bubble.created_at)
+
+
+@event.listens_for(Bubble, 'after_insert')
+def _bubble_inserted(mapper, connection, bubble):
+    topics = TopicStats.__table__
+    _bump_topic(connection, bubble.topic, bubble_count=topics.c.bubble_count + 1)
+
+
+@event.listens_for(Bubble, 'after_delete')
+def _bubble_deleted(mapper, connection, bubble):
+    topics = TopicStats.__table__
+    _bump_topic(connection, bubble.topic, bubble_count=topics.c.bubble_count - 1)
+
+
+@event.listens_for(Post, 'after_insert')
+def _post_inserted(mapper, connection, post):
+    bubbles = Bubble.__table__
+    topics = TopicStats.__table__
+    
+    resonance = post.resonance or 0.0
+    
+    connection.execute(bubbles.update()
+                       .where(bubbles.c.id == post.bubble_id)
+                       .values(post_count=bubbles.c.post_count + 1,
+                               resonance_total=bubbles.c.resonance_total + resonance,
+                               last_post_at=_latest(bubbles.c.last_post_at, post.created_at),
+                               hot_score=_hot_score(func.ln,
+                                                    bubbles.c.post_count + 1,
+                                                    bubbles.c.view_count,
+                                                    bubbles.c.resonance_total + resonance,
+                                                    func.coalesce(bubbles.c.permeability, 0.6),
+                                                    post.created_at)))
+    _bump_topic(connection, _topic_of(post.bubble_id),
+                post_count=topics.c.post_count + 1,
+                last_post_at=_latest(topics.c.last_post_at, post.created_at))
+
+
+@event.listens_for(Post, 'after_delete')
+def _post_deleted(mapper, connection, post):
+    bubbles = Bubble.__table__
+    posts = Post.__table__
+    topics = TopicStats.__table__
+    
+    latest_post = (db.select(func.max(posts.c.created_at))
+                   .where(posts.c.bubble_id == post.bubble_id)
+                   .scalar_subquery())
+    resonance = post.resonance or 0.0
+    views = post.views or 0
+    
+    # Keep the activity term: the bubble was still active when it was posted
+    # to, so only the engagement part of the score is swapped. reconcile-counters
+    # recomputes the whole score from last_post_at.
+    connection.execute(bubbles.update()
+                       .where(bubbles.c.id == post.bubble_id)
+                       .values(post_count=bubbles.c.post_count - 1,
+                               view_count=bubbles.c.view_count - views,
+                               resonance_total=bubbles.c.resonance_total - resonance,
+                               last_post_at=latest_post,
+                               hot_score=bubbles.c.hot_score
+                               - _engagement(func.ln, bubbles.c.post_count, bubbles.c.view_count,
+                                             bubbles.c.resonance_total)
+                               + _engagement(func.ln, bubbles.c.post_count - 1,
+                                             bubbles.c.view_count - views,
+                                             bubbles.c.resonance_total - resonance)))
+    _bump_topic(connection, _topic_of(post.bubble_id),
+                post_count=topics.c.post_count - 1)
+
+
+def reconcile_counters():
+    """Rebuild every denormalized counter from the Bubble and Post tables."""
+    with app.app_context():
+        bubbles = Bubble.__table__
+        posts = Post.__table__
+        
+        def per_bubble(aggregate):
+            return db.select(aggregate).where(posts.c.bubble_id == bubbles.c.id).scalar_subquery()
+        
+        users = User.__table__
+        top_eight = TopEight.__table__
+        followers = db.select(func.count(top_eight.c.id)).where(top_eight.c.friend_id == users.c.id)
+        db.session.execute(users.update().values(follower_count=followers.scalar_subquery()))
+        
+        db.session.execute(bubbles.update().values(
+            post_count=per_bubble(func.count(posts.c.id)),
+            last_post_at=per_bubble(func.max(posts.c.created_at)),
+            view_count=per_bubble(func.coalesce(func.sum(posts.c.views), 0)),
+            resonance_total=per_bubble(func.coalesce(func.sum(posts.c.resonance), 0.0))))
+        rerank_bubbles()
+        
+        rows = (db.session.query(Bubble.topic,
+                                 func.count(Bubble.id),
+                                 func.coalesce(func.sum(Bubble.post_count), 0),
+                                 func.max(Bubble.last_post_at))
+                .group_by(Bubble.topic))
+        
+        counts = {topic: (0, 0, None) for topic in TOPICS}
+        counts.update((topic, (bubble_count, post_count, last_post_at))
+                      for topic, bubble_count, post_count, last_post_at in rows)
+        
+        TopicStats.query.delete()
+        db.session.add_all(TopicStats(topic=topic, bubble_count=bubble_count,
+                                      post_count=post_count, last_post_at=last_post_at)
+                           for topic, (bubble_count, post_count, last_post_at) in counts.items())
+        db.session.commit()
+        print(f"✓ Counters reconciled across {len(counts)} topics")
+
+
+@app.cli.command('reconcile-counters')
+def reconcile_counters_command():
+    """Rebuild bubble and topic counters from scratch."""
+    reconcile_counters()
+
+
+# ============================================================================
+# RANKING
+# ============================================================================
+
+# Bubble.hot_score = ln(1 + engagement) + permeability bonus + activity time
+#
+# where engagement = posts + HOT_VIEW_WEIGHT * views + HOT_RESONANCE_WEIGHT *
+# total resonance, and the time term grows by one every HOT_DECAY_SECONDS
+# since HOT_EPOCH. A quiet bubble therefore sinks below newer activity
+# without its row ever being rewritten: decay lives in the comparison, not
+# the stored value. Post writes recompute the score in their counter UPDATE;
+# buffered views fold in on the view counter's background flush.
+
+HOT_EPOCH = datetime(2026, 2, 1, 2, 44)
+
+
+def _engagement(ln, post_count, view_count, resonance_total):
+    """Engagement term; works on numbers (ln=math.log) or columns (ln=func.ln)."""
+    return ln(1 + post_count
+              + app.config['HOT_VIEW_WEIGHT'] * view_count
+              + app.config['HOT_RESONANCE_WEIGHT'] * resonance_total)
+
+
+def _hot_score(ln, post_count, view_count, resonance_total, permeability, active_at):
+    return (_engagement(ln, post_count, view_count, resonance_total)
+            + app.config['HOT_PERMEABILITY_WEIGHT'] * permeability
+            + (active_at - HOT_EPOCH).total_seconds() / app.config['HOT_DECAY_SECONDS'])
+
+
+def rerank_bubbles(chunk_size=10000):
+    """Recompute every hot score from the bubble counters, in chunks."""
+    bubbles = Bubble.__table__
+    rows = db.session.execute(db.select(bubbles.c.id, bubbles.c.post_count, bubbles.c.view_count,
+                                        bubbles.c.resonance_total, bubbles.c.permeability,
+                                        bubbles.c.last_post_at, bubbles.c.created_at)).all()
+    scores = [{'bubble_id': bubble_id,
+               'score': _hot_score(math.log, post_count, view_count, resonance_total,
+                                   0.6 if permeability is None else permeability,
+                                   last_post_at or created_at)}
+              for bubble_id, post_count, view_count, resonance_total, permeability,
+                  last_post_at, created_at in rows]
+    
+    update = (bubbles.update()
+              .where(bubbles.c.id == db.bindparam('bubble_id'))
+              .values(hot_score=db.bindparam('score')))
+    for start in range(0, len(scores), chunk_size):
+        db.session.execute(update, scores[start:start + chunk_size])
+
+
+def popular_bubbles(query):
+    """Order a Bubble query by hot score - an index scan on (topic, hot_score)."""
+    return query.order_by(Bubble.hot_score.desc(), Bubble.id.desc())
+
+
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+# One SQLite FTS5 table per searchable model, keyed by rowid = model id, so
+# keeping an entry in sync is a rowid lookup rather than a scan. Other
+# databases fall back to LIKE matching in search_models().
+
+SEARCH_INDEXES = {
+    'bubble_search': (Bubble, ('title', 'description'), (4.0, 1.0)),
+    'post_search': (Post, ('content',), (1.0,)),
+    'user_search': (User, ('username', 'display_name', 'bio'), (4.0, 4.0, 1.0)),
+}
+
+# Relationships each kind of search result renders with
+SEARCH_LOADERS = {
+    'bubble_search': (joinedload(Bubble.creator),),
+    'post_search': (joinedload(Post.author), joinedload(Post.bubble)),
+    'user_search': (),
+}
+
+def _index_row(connection, name, columns, row):
+    connection.execute(text(f"DELETE FROM {name} WHERE rowid = :id"), {'id': row.id})
+    connection.execute(text(f"INSERT INTO {name} (rowid, {', '.join(columns)}) "
+                            f"VALUES (:id, {', '.join(':' + c for c in columns)})"),
+                       {'id': row.id, **{c: getattr(row, c) or '' for c in columns}})
+
+
+def _register_search_index(name, model, columns):
+    event.listen(db.metadata, 'after_create',
+                 DDL(f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} "
+                     f"USING fts5({', '.join(columns)}, tokenize='unicode61 remove_diacritics 2')")
+                 .execute_if(dialect='sqlite'))
+    
+    def indexed(mapper, connection, row):
+        if connection.dialect.name == 'sqlite':
+            _index_row(connection, name, columns, row)
+    
+    def unindexed(mapper, connection, row):
+        if connection.dialect.name == 'sqlite':
+            connection.execute(text(f"DELETE FROM {name} WHERE rowid = :id"), {'id': row.id})
+    
+    event.listen(model, 'after_insert', indexed)
+    event.listen(model, 'after_update', indexed)
+    event.listen(model, 'after_delete', unindexed)
+
+
+for _name, (_model, _columns, _weights) in SEARCH_INDEXES.items():
+    _register_search_index(_name, _model, _columns)
+
+
+def fts_query(q):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    terms = q.split()
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_models(name, q, page, per_page):
+    """Return one page of models matching q, best match first."""
+    model, columns, weights = SEARCH_INDEXES[name]
+    match = fts_query(q)
+    if not match:
+        return []
+    
+    if db.engine.dialect.name != 'sqlite':
+        like = db.or_(*(getattr(model, c).contains(q) for c in columns))
+        return (model.query.options(*SEARCH_LOADERS[name]).filter(like).order_by(model.id.desc())
+                     .limit(per_page).offset((page - 1) * per_page).all())
+    
+    ids = db.session.execute(
+        text(f"SELECT rowid FROM {name} WHERE {name} MATCH :match "
+             f"ORDER BY bm25({name}, {', '.join(map(str, weights))}) "
+             f"LIMIT :limit OFFSET :offset"),
+        {'match': match, 'limit': per_page, 'offset': (page - 1) * per_page}).scalars().all()
+    
+    rows = {row.id: row for row in model.query.options(*SEARCH_LOADERS[name]).filter(model.id.in_(ids))}
+    return [rows[i] for i in ids if i in rows]
+
+
+def rebuild_search_index():
+    """Repopulate every FTS table from its source table."""
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            print("✓ No search index to rebuild; search uses LIKE on this database")
+            return
+        db.create_all()
+        for name, (model, columns, weights) in SEARCH_INDEXES.items():
+            selected = ', '.join(f"coalesce({c}, '')" for c in columns)
+            db.session.execute(text(f"DELETE FROM {name}"))
+            db.session.execute(text(f"INSERT INTO {name} (rowid, {', '.join(columns)}) "
+                                    f"SELECT id, {selected} FROM {model.__tablename__}"))
+        db.session.commit()
+        print(f"✓ Search index rebuilt ({', '.join(SEARCH_INDEXES)})")
+
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Rebuild the full-text search tables from scratch."""
+    rebuild_search_index()
+
+
+# ============================================================================
+# VIEW COUNTING
+# ============================================================================
+
+class ViewCounter:
+    """Buffers Post.views increments in memory and writes them in batches.
+    
+    Readers only touch an in-process Counter; a daemon thread flushes it in
+    one transaction every VIEW_FLUSH_INTERVAL seconds, or sooner once
+    VIEW_FLUSH_THRESHOLD posts are pending, adding the views to each
+    bubble's total and hot score as well. A crash loses at most one
+    interval of views. The thread starts lazily so forked workers each run
+    their own.
+    """
+    
+    def __init__(self):
+        self.pending = Counter()
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+    
+    def record(self, post_ids):
+        with self.lock:
+            self.pending.update(post_ids)
+            backlog = len(self.pending)
+        
+        if self._pid != os.getpid():
+            self._start()
+        if backlog >= app.config['VIEW_FLUSH_THRESHOLD']:
+            self._wake.set()
+    
+    def flush(self):
+        """Write every pending increment in one transaction. Returns how many posts were pending.
+        
+        One UPDATE adds the views to the posts. A SELECT of those posts finds
+        their bubbles, and a second UPDATE adds each bubble's share to its
+        view_count and moves its hot_score by the change in engagement.
+        """
+        with self.lock:
+            batch, self.pending = self.pending, Counter()
+        if not batch:
+            return 0
+        
+        posts = Post.__table__
+        bubbles = Bubble.__table__
+        try:
+            with app.app_context():
+                db.session.execute(posts.update()
+                                   .where(posts.c.id.in_(batch))
+                                   .values(views=func.coalesce(posts.c.views, 0)
+                                           + case(dict(batch), value=posts.c.id)))
+                
+                # Fold the same views into each bubble's total and hot score
+                per_bubble = Counter()
+                for post_id, bubble_id in db.session.execute(
+                        db.select(posts.c.id, posts.c.bubble_id).where(posts.c.id.in_(batch))):
+                    per_bubble[bubble_id] += batch[post_id]
+                if per_bubble:
+                    added = case(dict(per_bubble), value=bubbles.c.id)
+                    db.session.execute(bubbles.update()
+                                       .where(bubbles.c.id.in_(per_bubble))
+                                       .values(view_count=bubbles.c.view_count + added,
+                                               hot_score=bubbles.c.hot_score
+                                               - _engagement(func.ln, bubbles.c.post_count,
+                                                             bubbles.c.view_count,
+                                                             bubbles.c.resonance_total)
+                                               + _engagement(func.ln, bubbles.c.post_count,
+                                                             bubbles.c.view_count + added,
+                                                             bubbles.c.resonance_total)))
+                db.session.commit()
+        except Exception:
+            # Keep the increments for the next attempt rather than dropping them
+            with self.lock:
+                self.pending.update(batch)
+            raise
+        
+        return len(batch)
+    
+    def _start(self):
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='view-counter', daemon=True).start()
+    
+    def _run(self):
+        while True:
+            self._wake.wait(app.config['VIEW_FLUSH_INTERVAL'])
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                app.logger.exception("View count flush failed; will retry")
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
+
+
+# ============================================================================
+# QUERY BUDGETS
+# ============================================================================
+# Every read route declares how many SQL statements it may issue. Going
+# over budget raises under app.testing (so the test fails) and logs a
+# warning under app.debug; in production the counter is just an integer.
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+
+@app.before_request
+def _start_query_count():
+    # Budgets cover the view itself, not loading the session that precedes it
+    g.query_count = 0
+
+
+def query_budget(limit):
+    """Declare the most SQL statements a view may run per request."""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+@app.after_request
+def _check_query_budget(response):
+    if not (app.debug or app.testing):
+        return response
+    
+    view = app.view_functions.get(request.endpoint)
+    limit = getattr(view, 'query_budget', None)
+    count = g.get('query_count', 0)
+    
+    if limit is not None and count > limit:
+        message = f"{request.endpoint} ran {count} queries (budget {limit}) for {request.full_path}"
+        if app.testing:
+            raise QueryBudgetExceeded(message)
+        app.logger.warning(message)
+    
+    return response
+
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+# With INSTRUMENTATION_ENABLED, each request records its SQL statements and
+# their time, template render time, password hashing time and total time.
+# They are reported in a Server-Timing header, one JSON log line on the
+# 'righton.requests' logger, and per-route histograms at /metrics. When
+# disabled no listener is attached, so requests pay nothing.
+
+request_log = logging.getLogger('righton.requests')
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label, rendered in Prometheus text format."""
+    
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}    # label -> [count per bucket..., +Inf count, sum]
+        self.lock = threading.Lock()
+    
+    def observe(self, label, value):
+        with self.lock:
+            series = self.series.setdefault(label, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+    
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for label, series in sorted(self.series.items()):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f'{self.name}_bucket{{route="{label}",le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{route="{label}",le="+Inf"}} {series[-2]}')
+                lines.append(f'{self.name}_sum{{route="{label}"}} {series[-1]:.6f}')
+                lines.append(f'{self.name}_count{{route="{label}"}} {series[-2]}')
+        return lines
+
+
+SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+METRICS = [
+    Histogram('righton_request_duration_seconds', 'Time to handle a request.', SECONDS),
+    Histogram('righton_db_duration_seconds', 'Time spent in SQL per request.', SECONDS),
+    Histogram('righton_template_duration_seconds', 'Time spent rendering templates per request.', SECONDS),
+    Histogram('righton_db_queries', 'SQL statements per request.', (1, 2, 5, 10, 20, 50, 100)),
+]
+request_duration, db_duration, template_duration, db_queries = METRICS
+
+
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and conn.info.get('query_started'):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        g.setdefault('query_timings', []).append((elapsed, statement))
+
+
+def _template_started(sender, template, context, **extra):
+    g.template_started = time.perf_counter()
+
+
+def _template_finished(sender, template, context, **extra):
+    started = g.pop('template_started', None)
+    if started is not None:
+        g.template_time = g.get('template_time', 0.0) + time.perf_counter() - started
+
+
+def _request_started():
+    g.request_started = time.perf_counter()
+
+
+def _request_finished(response):
+    started = g.get('request_started')
+    if started is None:
+        return response
+    
+    total = time.perf_counter() - started
+    timings = g.get('query_timings', [])
+    query_time = sum(elapsed for elapsed, _ in timings)
+    template_time = g.get('template_time', 0.0)
+    hash_time = g.get('hash_time', 0.0)
+    route = request.endpoint or 'unmatched'
+    
+    response.headers['X-Query-Count'] = str(len(timings))
+    response.headers['Server-Timing'] = (f'db;dur={query_time * 1000:.2f};desc="{len(timings)} queries", '
+                                         f'tpl;dur={template_time * 1000:.2f}, '
+                                         f'hash;dur={hash_time * 1000:.2f}, '
+                                         f'total;dur={total * 1000:.2f}')
+    
+    request_duration.observe(route, total)
+    db_duration.observe(route, query_time)
+    template_duration.observe(route, template_time)
+    db_queries.observe(route, len(timings))
+    
+    slowest = sorted(timings, reverse=True)[:app.config['INSTRUMENTATION_SLOWEST']]
+    request_log.info(json.dumps({
+        'route': route,
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        'total_ms': round(total * 1000, 2),
+        'queries': len(timings),
+        'query_ms': round(query_time * 1000, 2),
+        'template_ms': round(template_time * 1000, 2),
+        'hash_ms': round(hash_time * 1000, 2),
+        'slowest': [{'ms': round(elapsed * 1000, 2), 'sql': ' '.join(statement.split())[:200]}
+                    for elapsed, statement in slowest],
+    }))
+    return response
+
+
+def enable_instrumentation():
+    """Attach the timing hooks. Called at import when INSTRUMENTATION_ENABLED is set."""
+    event.listen(Engine, 'before_cursor_execute', _query_started)
+    event.listen(Engine, 'after_cursor_execute', _query_finished)
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+    app.before_request_funcs.setdefault(None, []).insert(0, _request_started)
+    app.after_request(_request_finished)
+
+
+if app.config['INSTRUMENTATION_ENABLED']:
+    enable_instrumentation()
+
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+class ServerSideSession(SecureCookieSession):
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        super().__init__(initial)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.retired_sid = None
+    
+    def regenerate(self):
+        """Move the data to a fresh id when it is saved; the old row is deleted."""
+        if self.sid is not None:
+            self.retired_sid = self.sid
+        self.sid = None
+        self.modified = True
+
+
+class DatabaseSessionInterface(SessionInterface):
+    """Keeps session data in the ServerSession table, shared by every worker.
+    
+    Rows are written only when the session changes or is past half its
+    lifetime, so ordinary page views stay read-only. Expired rows are purged
+    every SESSION_SWEEP_EVERY saves and by `flask sweep-sessions`.
+    """
+    
+    serializer = TaggedJSONSerializer()
+    
+    def __init__(self):
+        self.saves = 0
+    
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='righton-session')
+    
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if not cookie:
+            return ServerSideSession()
+        
+        try:
+            sid = self._signer(app).unsign(cookie).decode()
+        except BadSignature:
+            return ServerSideSession()
+        
+        sessions = ServerSession.__table__
+        with db.engine.connect() as conn:
+            row = conn.execute(db.select(sessions.c.data, sessions.c.expires_at)
+                               .where(sessions.c.id == sid)).first()
+        
+        if row is None or row.expires_at <= datetime.utcnow():
+            return ServerSideSession()
+        return ServerSideSession(self.serializer.loads(row.data), sid=sid, expires_at=row.expires_at)
+    
+    def save_session(self, app, session, response):
+        cookie_name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        sessions = ServerSession.__table__
+        
+        if session.retired_sid:
+            with db.engine.begin() as conn:
+                conn.execute(sessions.delete().where(sessions.c.id == session.retired_sid))
+        
+        if not session:
+            if session.sid:
+                with db.engine.begin() as conn:
+                    conn.execute(sessions.delete().where(sessions.c.id == session.sid))
+            if session.modified:
+                response.delete_cookie(cookie_name, domain=domain, path=path)
+            return
+        
+        if session.accessed:
+            response.vary.add('Cookie')
+        
+        lifetime = app.permanent_session_lifetime
+        now = datetime.utcnow()
+        stale = session.expires_at is not None and session.expires_at - now < lifetime / 2
+        if not (session.modified or stale or session.sid is None):
+            return
+        
+        sid = session.sid or secrets.token_urlsafe(32)
+        values = {'data': self.serializer.dumps(dict(session)), 'expires_at': now + lifetime}
+        with db.engine.begin() as conn:
+            if session.sid is None or not conn.execute(
+                    sessions.update().where(sessions.c.id == sid).values(**values)).rowcount:
+                conn.execute(sessions.insert().values(id=sid, **values))
+        
+        self.saves += 1
+        if self.saves % app.config['SESSION_SWEEP_EVERY'] == 0:
+            sweep_sessions()
+        
+        response.set_cookie(cookie_name, self._signer(app).sign(sid).decode(),
+                            expires=self.get_expiration_time(app, session),
+                            httponly=self.get_cookie_httponly(app),
+                            domain=domain,
+                            path=path,
+                            secure=self.get_cookie_secure(app),
+                            samesite=self.get_cookie_samesite(app))
+
+
+def sweep_sessions():
+    """Delete expired server-side sessions. Returns how many were removed."""
+    sessions = ServerSession.__table__
+    with db.engine.begin() as conn:
+        return conn.execute(sessions.delete().where(sessions.c.expires_at <= datetime.utcnow())).rowcount
+
+
+@app.cli.command('sweep-sessions')
+def sweep_sessions_command():
+    """Remove expired server-side sessions."""
+    print(f"✓ Swept {sweep_sessions()} expired sessions")
+
+
+if app.config['SESSION_STORE'] == 'database':
+    app.session_interface = DatabaseSessionInterface()
+
+
+def sign_in(user):
+    """Put user in the session under a new id, so an id planted before sign-in is worthless."""
+    if isinstance(session._get_current_object(), ServerSideSession):
+        session.regenerate()
+    # Signed-cookie sessions carry their data, not an id, and are reissued anyway
+    session['user_id'] = user.id
+    session['username'] = user.username
+
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+class ResponseCache:
+    """Caches rendered pages for logged-out readers, keyed by route and arguments.
+    
+    Each cached view names tags built from its URL arguments ('bubble:7').
+    A tag's current generation token is folded into the key, so
+    invalidate() orphans every page under that tag for all workers sharing
+    the backend at once; orphans then age out through TTL and LRU.
+    """
+    
+    def __init__(self):
+        self._backend = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = make_cache(app.config['RESPONSE_CACHE'],
+                                       max_entries=app.config['RESPONSE_CACHE_MAX_ENTRIES'])
+        return self._backend
+    
+    def _generation(self, tag):
+        token = self.backend.get('tag:' + tag)
+        if token is None:
+            # Unknown or evicted tag - start a fresh generation, which can
+            # only ever cause a miss, never a stale hit
+            token = secrets.token_hex(8)
+            self.backend.set('tag:' + tag, token)
+        return token
+    
+    def invalidate(self, *tags):
+        for tag in tags:
+            self.backend.set('tag:' + tag, secrets.token_hex(8))
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': app.config['RESPONSE_CACHE'].split(':')[0],
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+    
+    def _count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def cached(self, *tags):
+        """Decorate a view; tags are format strings over its URL arguments."""
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(**kwargs):
+                if (not app.config['RESPONSE_CACHE_ENABLED']
+                        or 'user_id' in session or '_flashes' in session):
+                    return view(**kwargs)
+                
+                generations = ':'.join(self._generation(tag.format(**kwargs)) for tag in tags)
+                query = urlencode(sorted(request.args.items(multi=True)))
+                key = f"page:{request.path}?{query}:{generations}"
+                
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self._count(hit=True)
+                    if entry['viewed']:
+                        view_counter.record(entry['viewed'])
+                    response = app.response_class(entry['body'], mimetype=entry['mimetype'])
+                    response.headers.update(entry.get('headers', {}))
+                    response.headers['X-Cache'] = 'HIT'
+                    return response.make_conditional(request)
+                
+                self._count(hit=False)
+                response = app.make_response(view(**kwargs))
+                if response.status_code == 200 and not session.modified:
+                    self.backend.set(key, {
+                        'body': response.get_data(as_text=True),
+                        'mimetype': response.mimetype,
+                        'headers': {name: response.headers[name] for name in CACHED_HEADERS
+                                    if name in response.headers},
+                        'viewed': g.get('viewed_post_ids', []),
+                    }, ttl=app.config['RESPONSE_CACHE_TTL'])
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary')
+
+response_cache = ResponseCache()
+
+
+# ============================================================================
+# LIVE UPDATES
+# ============================================================================
+# New posts are published after commit to the configured broker; the
+# asyncio event server in realtime.py fans them out to open EventSources.
+# A broker outage costs live updates, never the write itself.
+
+event_broker = make_broker(app.config['REALTIME_BROKER'])
+realtime_log = logging.getLogger('righton.realtime')
+
+
+def publish_posts(posts, author):
+    """Push committed posts to everyone watching their bubbles."""
+    if event_broker is None:
+        return
+    for post in posts:
+        try:
+            event_broker.publish(f'bubble:{post.bubble_id}',
+                                 dict(_post_json(post), author=author.username,
+                                      author_name=author.display_name))
+        except OSError as e:
+            realtime_log.warning("Could not publish post %s: %s", post.id, e)
+            return
+
+
+def events_url(bubble_id):
+    return f"{app.config['REALTIME_EVENTS_URL']}/bubble/{bubble_id}/events"
+
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+# Keyset pagination on (created_at, id): each page seeks straight to its
+# cursor through the composite indexes, so page 1000 costs the same as page 1.
+
+def encode_cursor(row):
+    raw = f"{row.created_at.isoformat()}|{row.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) for a cursor, or None if it is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def keyset_page(query, model, cursor, per_page):
+    """Fetch one newest-first page of a query, plus the cursor for the next page."""
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    
+    position = decode_cursor(cursor)
+    if position:
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(*position))
+    
+    rows = query.limit(per_page + 1).all()
+    next_cursor = encode_cursor(rows[per_page - 1]) if len(rows) > per_page else None
+    
+    return rows[:per_page], next_cursor
+
+
+# ============================================================================
+# JOB QUEUE
+# ============================================================================
+# Side effects that need not finish before the response go through the job
+# table. enqueue() writes the row in the caller's transaction, so a job
+# exists exactly when the write that needs it committed. Workers
+# (`python worker.py`) claim jobs with one UPDATE ... RETURNING, run the
+# handler and delete the job in a single transaction; failures retry with
+# exponential backoff and, after JOB_MAX_ATTEMPTS, stay as 'dead' rows for
+# inspection (`flask retry-dead-jobs` requeues them).
+#
+# Work that must commit with its row stays in mapper events: topic counters,
+# hot scores, search index rows and compiled profiles. register and
+# bubble_create do nothing else, so they enqueue nothing. Today only feed
+# fan-out from posts is deferred.
+
+JOB_HANDLERS = {}
+jobs_log = logging.getLogger('righton.jobs')
+
+
+def job_handler(kind):
+    """Register a function(connection, **payload) as the handler for a job kind."""
+    def decorator(handler):
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+
+def enqueue(kind, connection=None, delay=0, **payload):
+    """Queue a job in the current transaction (the session's, or `connection`)."""
+    jobs = Job.__table__
+    connection = connection or db.session.connection()
+    now = datetime.utcnow()
+    connection.execute(jobs.insert().values(kind=kind, payload=json.dumps(payload), status='queued',
+                                            attempts=0, run_at=now + timedelta(seconds=delay),
+                                            created_at=now))
+
+
+def _claimable(now):
+    jobs = Job.__table__
+    lease = now - timedelta(seconds=app.config['JOB_LEASE_SECONDS'])
+    return db.or_(db.and_(jobs.c.status == 'queued', jobs.c.run_at <= now),
+                  db.and_(jobs.c.status == 'running', jobs.c.locked_at < lease))
+
+
+def claim_job(worker_id):
+    """Atomically take the oldest due job; returns its row or None."""
+    jobs = Job.__table__
+    now = datetime.utcnow()
+    oldest = (db.select(jobs.c.id).where(_claimable(now))
+              .order_by(jobs.c.run_at, jobs.c.id).limit(1).scalar_subquery())
+    
+    with db.engine.begin() as connection:
+        return connection.execute(
+            jobs.update()
+            .where(jobs.c.id == oldest, _claimable(now))
+            .values(status='running', locked_by=worker_id, locked_at=now,
+                    attempts=jobs.c.attempts + 1)
+            .returning(jobs.c.id, jobs.c.kind, jobs.c.payload, jobs.c.attempts)).first()
+
+
+def _backoff(attempts):
+    delay = min(app.config['JOB_BACKOFF_BASE'] * 2 ** (attempts - 1), app.config['JOB_BACKOFF_MAX'])
+    return delay * random.uniform(0.8, 1.2)
+
+
+def run_job(job, worker_id):
+    """Run a claimed job. Success deletes it with the handler's own writes."""
+    jobs = Job.__table__
+    mine = db.and_(jobs.c.id == job.id, jobs.c.locked_by == worker_id)
+    try:
+        handler = JOB_HANDLERS[job.kind]
+        with db.engine.begin() as connection:
+            handler(connection, **json.loads(job.payload))
+            connection.execute(jobs.delete().where(mine))
+        return True
+    except Exception as e:
+        dead = job.attempts >= app.config['JOB_MAX_ATTEMPTS']
+        values = {'status': 'dead'} if dead else \
+            {'status': 'queued', 'run_at': datetime.utcnow() + timedelta(seconds=_backoff(job.attempts))}
+        with db.engine.begin() as connection:
+            connection.execute(jobs.update().where(mine)
+                               .values(locked_by=None, locked_at=None, last_error=repr(e), **values))
+        jobs_log.log(logging.ERROR if dead else logging.WARNING,
+                     "Job %s (%s) failed on attempt %s%s", job.id, job.kind, job.attempts,
+                     "; dead-lettered" if dead else "; will retry", exc_info=dead)
+        return False
+
+
+def run_jobs(worker_id='inline', limit=None):
+    """Run due jobs until none are left (or `limit` ran). Returns how many ran."""
+    ran = 0
+    with app.app_context():
+        while limit is None or ran < limit:
+            job = claim_job(worker_id)
+            if job is None:
+                break
+            run_job(job, worker_id)
+            ran += 1
+    return ran
+
+
+def work(worker_id, stop):
+    """Worker loop: run jobs as they come due until `stop` (an Event) is set."""
+    jobs_log.info("Worker %s started", worker_id)
+    while not stop.is_set():
+        try:
+            if not run_jobs(worker_id, limit=100):
+                stop.wait(app.config['JOB_POLL_INTERVAL'])
+        except Exception:
+            jobs_log.exception("Worker %s could not reach the job table", worker_id)
+            stop.wait(app.config['JOB_POLL_INTERVAL'])
+
+
+def job_queue_stats():
+    """Job counts by status, and how long the oldest due job has been waiting."""
+    jobs = Job.__table__
+    now = datetime.utcnow()
+    counts = {'queued': 0, 'running': 0, 'dead': 0}
+    counts.update(db.session.execute(db.select(jobs.c.status, func.count())
+                                     .group_by(jobs.c.status)).all())
+    oldest_due = db.session.execute(db.select(func.min(jobs.c.run_at))
+                                    .where(jobs.c.status == 'queued', jobs.c.run_at <= now)).scalar()
+    counts['lag_seconds'] = (now - oldest_due).total_seconds() if oldest_due else 0.0
+    return counts
+
+
+@app.cli.command('run-jobs')
+def run_jobs_command():
+    """Run every due job in this process, then exit."""
+    print(f"✓ Ran {run_jobs()} jobs")
+
+
+@app.cli.command('retry-dead-jobs')
+def retry_dead_jobs_command():
+    """Give dead-lettered jobs a fresh set of attempts."""
+    jobs = Job.__table__
+    with app.app_context():
+        result = db.session.execute(jobs.update().where(jobs.c.status == 'dead')
+                                    .values(status='queued', attempts=0, run_at=datetime.utcnow()))
+        db.session.commit()
+    print(f"✓ Requeued {result.rowcount} dead jobs")
+
+
+# ============================================================================
+# FEEDS
+# ============================================================================
+# A home feed is the posts of everyone in the reader's Top 8, newest first.
+# Each post is copied into its author's followers' feeds by a background job
+# (fan-out-on-write), so reading a feed is one range scan of
+# (user_id, created_at, post_id). Authors held by more than
+# FEED_FANOUT_LIMIT Top 8s are skipped on write and merged in at read time
+# instead (fan-out-on-read), so one post never costs a million inserts.
+# Feeds are capped at FEED_MAX_ENTRIES: a post whose id is a multiple of
+# FEED_TRIM_EVERY trims its author's followers' feeds - about one post in N
+# for every author, sampled on the global post id rather than counted per
+# author - and `flask trim-feeds` trims everyone.
+
+def _fanned_out(author_id):
+    """SQL condition: this author's posts are copied into feeds on write."""
+    users = User.__table__
+    return db.exists().where(users.c.id == author_id,
+                             users.c.follower_count <= app.config['FEED_FANOUT_LIMIT'])
+
+
+def _trim_feeds(connection, user_ids=None):
+    """Delete entries beyond FEED_MAX_ENTRIES from every feed, or from user_ids' feeds."""
+    feed = FeedEntry.__table__
+    ranked = db.select(feed.c.user_id, feed.c.post_id,
+                       func.row_number().over(partition_by=feed.c.user_id,
+                                              order_by=(feed.c.created_at.desc(),
+                                                        feed.c.post_id.desc())).label('rank'))
+    if user_ids is not None:
+        ranked = ranked.where(feed.c.user_id.in_(user_ids))
+    ranked = ranked.subquery()
+    
+    overflow = (db.select(ranked.c.user_id, ranked.c.post_id)
+                .where(ranked.c.rank > app.config['FEED_MAX_ENTRIES']))
+    result = connection.execute(feed.delete()
+                                .where(tuple_(feed.c.user_id, feed.c.post_id).in_(overflow)))
+    return result.rowcount
+
+
+@event.listens_for(Post, 'after_insert')
+def _post_queued_for_fan_out(mapper, connection, post):
+    # Commits with the post; the copying happens on a worker
+    enqueue('fan_out_post', connection=connection, post_id=post.id)
+
+
+@job_handler('fan_out_post')
+def fan_out_post(connection, post_id):
+    """Copy a post into its author's followers' feeds (a no-op if it is gone)."""
+    posts = Post.__table__
+    feed = FeedEntry.__table__
+    top_eight = TopEight.__table__
+    
+    # Idempotent: a Top 8 backfill may already have copied the post
+    present = db.exists().where(feed.c.user_id == top_eight.c.user_id, feed.c.post_id == post_id)
+    followers = (db.select(top_eight.c.user_id, posts.c.id, posts.c.created_at)
+                 .join(posts, posts.c.author_id == top_eight.c.friend_id)
+                 .where(posts.c.id == post_id, _fanned_out(posts.c.author_id), ~present)
+                 .distinct())
+    connection.execute(feed.insert().from_select(['user_id', 'post_id', 'created_at'], followers))
+    
+    if post_id % app.config['FEED_TRIM_EVERY'] == 0:
+        author = db.select(posts.c.author_id).where(posts.c.id == post_id).scalar_subquery()
+        _trim_feeds(connection, db.select(top_eight.c.user_id)
+                    .where(top_eight.c.friend_id == author))
+
+
+@event.listens_for(Post, 'before_delete')
+def _post_unfanned(mapper, connection, post):
+    # Before, not after: FeedEntry.post_id references the post row
+    feed = FeedEntry.__table__
+    connection.execute(feed.delete().where(feed.c.post_id == post.id))
+
+
+def _top_eight_changed(connection, user_id):
+    # The Top 8 is part of the profile page, so its validators must move too
+    users = User.__table__
+    connection.execute(users.update().where(users.c.id == user_id)
+                       .values(profile_updated_at=datetime.utcnow()))
+
+
+@event.listens_for(TopEight, 'after_insert')
+def _friend_added(mapper, connection, edge):
+    users = User.__table__
+    posts = Post.__table__
+    feed = FeedEntry.__table__
+    
+    connection.execute(users.update()
+                       .where(users.c.id == edge.friend_id)
+                       .values(follower_count=users.c.follower_count + 1))
+    _top_eight_changed(connection, edge.user_id)
+    
+    # Backfill the new friend's recent posts
+    present = db.exists().where(feed.c.user_id == edge.user_id, feed.c.post_id == posts.c.id)
+    recent = (db.select(db.literal(edge.user_id), posts.c.id, posts.c.created_at)
+              .where(posts.c.author_id == edge.friend_id, _fanned_out(edge.friend_id), ~present)
+              .order_by(posts.c.created_at.desc(), posts.c.id.desc())
+              .limit(app.config['FEED_MAX_ENTRIES']))
+    connection.execute(feed.insert().from_select(['user_id', 'post_id', 'created_at'], recent))
+
+
+@event.listens_for(TopEight, 'after_delete')
+def _friend_removed(mapper, connection, edge):
+    users = User.__table__
+    posts = Post.__table__
+    top_eight = TopEight.__table__
+    feed = FeedEntry.__table__
+    
+    connection.execute(users.update()
+                       .where(users.c.id == edge.friend_id)
+                       .values(follower_count=users.c.follower_count - 1))
+    _top_eight_changed(connection, edge.user_id)
+    
+    # Their posts leave the feed unless another Top 8 slot still holds them
+    still_friends = db.exists().where(top_eight.c.user_id == edge.user_id,
+                                      top_eight.c.friend_id == edge.friend_id)
+    connection.execute(feed.delete().where(
+        feed.c.user_id == edge.user_id,
+        feed.c.post_id.in_(db.select(posts.c.id).where(posts.c.author_id == edge.friend_id)),
+        ~still_friends))
+
+
+def feed_page(user_id, cursor, per_page):
+    """One newest-first page of a user's home feed, plus the next cursor - one statement."""
+    feed = FeedEntry.__table__
+    posts = Post.__table__
+    users = User.__table__
+    top_eight = TopEight.__table__
+    
+    position = decode_cursor(cursor)
+    
+    def newest(select, created_at, row_id):
+        if position:
+            select = select.where(tuple_(created_at, row_id) < tuple_(*position))
+        return db.select(select.order_by(created_at.desc(), row_id.desc())
+                         .limit(per_page + 1).subquery())
+    
+    branches = [newest(db.select(feed.c.post_id.label('id'), feed.c.created_at)
+                       .where(feed.c.user_id == user_id),
+                       feed.c.created_at, feed.c.post_id)]
+    
+    # One range scan per pulled author (a Top 8 holds at most eight) rather
+    # than an IN list, which would sort every post those authors ever wrote
+    pulled_authors = (db.select(top_eight.c.friend_id)
+                      .join(users, users.c.id == top_eight.c.friend_id)
+                      .where(top_eight.c.user_id == user_id,
+                             users.c.follower_count > app.config['FEED_FANOUT_LIMIT'])
+                      .order_by(top_eight.c.position, top_eight.c.id))
+    for slot in range(8):
+        author = pulled_authors.limit(1).offset(slot).scalar_subquery()
+        branches.append(newest(db.select(posts.c.id, posts.c.created_at)
+                               .where(posts.c.author_id == author),
+                               posts.c.created_at, posts.c.id))
+    
+    # UNION, not UNION ALL: posts from before an author crossed the limit are in both
+    page = db.union(*branches).subquery()
+    query = (Post.query.options(joinedload(Post.author), joinedload(Post.bubble))
+             .join(page, page.c.id == Post.id))
+    return keyset_page(query, Post, None, per_page)
+
+
+def rebuild_feeds():
+    """Refill every home feed from the Top 8 graph (after bulk loads or a limit change).
+    
+    Per reader, the newest FEED_MAX_ENTRIES posts of each fanned-out friend
+    come off the (author_id, created_at) index and only the newest
+    FEED_MAX_ENTRIES of those are written.
+    """
+    with app.app_context():
+        users = User.__table__
+        posts = Post.__table__
+        top_eight = TopEight.__table__
+        feed = FeedEntry.__table__
+        limit = app.config['FEED_MAX_ENTRIES']
+        
+        friends = {}
+        for user_id, friend_id in db.session.execute(
+                db.select(top_eight.c.user_id, top_eight.c.friend_id).distinct()
+                .join(users, users.c.id == top_eight.c.friend_id)
+                .where(users.c.follower_count <= app.config['FEED_FANOUT_LIMIT'])):
+            friends.setdefault(user_id, []).append(friend_id)
+        
+        db.session.execute(feed.delete())
+        written = 0
+        for user_id, friend_ids in friends.items():
+            branches = [db.select(db.select(posts.c.id, posts.c.created_at)
+                                  .where(posts.c.author_id == friend_id)
+                                  .order_by(posts.c.created_at.desc(), posts.c.id.desc())
+                                  .limit(limit).subquery())
+                        for friend_id in friend_ids]
+            merged = db.union_all(*branches).subquery()
+            newest = (db.select(db.literal(user_id), merged.c.id, merged.c.created_at)
+                      .order_by(merged.c.created_at.desc(), merged.c.id.desc())
+                      .limit(limit))
+            written += db.session.execute(
+                feed.insert().from_select(['user_id', 'post_id', 'created_at'], newest)).rowcount
+        db.session.commit()
+        
+        print(f"✓ Feeds rebuilt ({written} entries)")
+
+
+@app.cli.command('rebuild-feeds')
+def rebuild_feeds_command():
+    """Refill every home feed from the Top 8 graph."""
+    rebuild_feeds()
+
+
+@app.cli.command('trim-feeds')
+def trim_feeds_command():
+    """Cut every home feed down to FEED_MAX_ENTRIES."""
+    with app.app_context():
+        with db.engine.begin() as connection:
+            trimmed = _trim_feeds(connection)
+    print(f"✓ Trimmed {trimmed} feed entries")
+
+
+# ============================================================================
+# STATIC ASSETS
+# ============================================================================
+# `python assets.py build` bundles, minifies and fingerprints static/ into
+# static/dist and writes a manifest. Templates call asset_url('site.css');
+# fingerprinted files are served from /assets/ as immutable, choosing a
+# precompressed .br or .gz sibling when the client accepts it. Without a
+# build, asset_url() falls back to plain /static/ URLs.
+
+ASSET_DIR = os.path.join(app.static_folder, 'dist')
+ASSET_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+_asset_manifest = {'mtime': None, 'entries': {}}
+
+
+def asset_manifest():
+    """The build manifest, read once (and re-read on change under debug)."""
+    if _asset_manifest['mtime'] is not None and not app.debug:
+        return _asset_manifest['entries']
+    
+    path = os.path.join(ASSET_DIR, 'manifest.json')
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if mtime != _asset_manifest['mtime']:
+        with open(path) as f:
+            _asset_manifest.update(entries=json.load(f), mtime=mtime)
+    return _asset_manifest['entries']
+
+
+@app.template_global()
+def asset_url(name):
+    built = asset_manifest().get(name)
+    if built is None:
+        return url_for('static', filename=name)
+    return url_for('asset', filename=built)
+
+
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    for encoding, suffix in ASSET_ENCODINGS:
+        compressed = safe_join(ASSET_DIR, filename + suffix)
+        if request.accept_encodings[encoding] and compressed and os.path.isfile(compressed):
+            response = send_from_directory(ASSET_DIR, filename + suffix,
+                                           mimetype=mimetypes.guess_type(filename)[0],
+                                           max_age=app.config['ASSET_MAX_AGE'])
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(ASSET_DIR, filename, max_age=app.config['ASSET_MAX_AGE'])
+    
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 # ============================================================================
@@ -114,11 +1772,27 @@ class Post(db.Model):
 # ============================================================================
 
 @app.route('/')
+@query_budget(1)
+@response_cache.cached('home')
 def index():
-    recent_bubbles = Bubble.query.order_by(Bubble.created_at.desc()).limit(6).all()
+    recent_bubbles = (Bubble.query.options(joinedload(Bubble.creator))
+                      .order_by(Bubble.created_at.desc()).limit(6).all())
     return render_template('index.html', recent_bubbles=recent_bubbles)
 
 
+@app.route('/feed')
+@query_budget(1)
+def feed():
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
+    
+    posts, next_cursor = feed_page(session['user_id'], request.args.get('cursor'),
+                                   app.config['POSTS_PER_PAGE'])
+    view_counter.record([post.id for post in posts])
+    
+    return render_template('feed.html', posts=posts, next_cursor=next_cursor)
+
+
 @app.route('/register', methods=['GET', 'POST'])
 def register():
     if request.method == 'POST':
@@ -138,13 +1812,16 @@ def register():
         )
         
         if user_type == 'human':
-            user.set_password(request.form['password'])
+            try:
+                user.set_password(request.form['password'])
+            except HashingBusy:
+                flash('RightOn is welcoming a lot of residents right now. Try again in a moment 💜')
+                return render_template('register.html'), 503
         
         db.session.add(user)
         db.session.commit()
         
-        session['user_id'] = user.id
-        session['username'] = user.username
+        sign_in(user)
         
         return redirect(url_for('profile', username=username))
     
@@ -154,11 +1831,31 @@ def register():
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
-        user = User.query.filter_by(username=request.form['username']).first()
+        username = request.form['username']
+        password = request.form['password']
+        
+        if not login_limiter.allow(request.remote_addr, username):
+            flash('Too many sign-in attempts. Breathe, then try again in a few minutes.')
+            return render_template('login.html'), 429
         
-        if user and user.check_password(request.form['password']):
-            session['user_id'] = user.id
-            session['username'] = user.username
+        user = User.query.filter_by(username=username).first()
+        
+        try:
+            authenticated = user is not None and user.check_password(password)
+        except HashingBusy:
+            flash('Sign-ins are busy right now. Try again in a moment.')
+            return render_template('login.html'), 503
+        
+        if authenticated:
+            login_limiter.reset(username)
+            if user.needs_rehash():
+                try:
+                    user.set_password(password)
+                    db.session.commit()
+                except HashingBusy:
+                    pass    # keep the old hash; the next login upgrades it
+            
+            sign_in(user)
             return redirect(url_for('index'))
         
         flash('Invalid credentials')
@@ -173,11 +1870,33 @@ def logout():
 
 
 @app.route('/profile/<username>')
+@query_budget(2)
+@response_cache.cached('user:{username}')
 def profile(username):
     user = User.query.filter_by(username=username).first_or_404()
-    top_eight = TopEight.query.filter_by(user_id=user.id).order_by(TopEight.position).limit(8).all()
     
-    return render_template('profile.html', user=user, top_eight=top_eight)
+    # Revalidations are answered from the user row alone - no Top 8, no template
+    response = app.response_class()
+    response.set_etag(profile_etag(user), weak=True)
+    response.last_modified = user.profile_updated_at or user.created_at
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    if '_flashes' not in session and response.make_conditional(request).status_code == 304:
+        return response
+    
+    top_eight = (TopEight.query.options(joinedload(TopEight.friend))
+                 .filter_by(user_id=user.id).order_by(TopEight.position).limit(8).all())
+    
+    response.set_data(render_template('profile.html', user=user, top_eight=top_eight,
+                                      profile_fragment=Markup(user.profile_fragment or '')))
+    return response
+
+
+def profile_etag(user):
+    """Changes with the compiled fragment, any profile edit and who is looking."""
+    updated = user.profile_updated_at or user.created_at
+    raw = f"{user.profile_hash}:{updated.isoformat()}:{session.get('user_id', '')}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
 
 
 @app.route('/profile/<username>/edit', methods=['GET', 'POST'])
@@ -202,6 +1921,7 @@ def edit_profile(username):
             user.kinship_vow = request.form.get('kinship_vow')
         
         db.session.commit()
+        response_cache.invalidate(f'user:{username}')
         flash('Profile updated! 💜')
         return redirect(url_for('profile', username=username))
     
@@ -209,45 +1929,60 @@ def edit_profile(username):
 
 
 @app.route('/bubbles')
+@query_budget(1)
+@response_cache.cached('home')
 def bubbles_home():
-    topics = ['politics', 'sports', 'fashion', 'health', 'entertainment', 'earth', 'news']
-    
-    topic_stats = {}
-    for topic in topics:
-        count = Bubble.query.filter_by(topic=topic).count()
-        topic_stats[topic] = count
+    topic_stats = {topic: 0 for topic in TOPICS}
+    topic_stats.update(db.session.query(TopicStats.topic, TopicStats.bubble_count)
+                                 .filter(TopicStats.topic.in_(TOPICS)))
     
-    return render_template('bubbles_home.html', topics=topics, stats=topic_stats)
+    return render_template('bubbles_home.html', topics=TOPICS, stats=topic_stats)
 
 
 @app.route('/bubbles/<topic>')
+@query_budget(1)
+@response_cache.cached('topic:{topic}')
 def bubbles_topic(topic):
     tab = request.args.get('tab', 'recent')
     scope = request.args.get('scope', 'all')
     
-    query = Bubble.query.filter_by(topic=topic)
+    query = Bubble.query.options(joinedload(Bubble.creator)).filter_by(topic=topic)
     
     if scope != 'all':
         query = query.filter_by(scope=scope)
     
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = app.config['BUBBLES_PER_PAGE']
+    next_cursor = None
+    
     if tab == 'popular':
-        bubbles = sorted(query.all(), key=lambda b: len(b.posts), reverse=True)
+        bubbles = popular_bubbles(query).limit(per_page).offset((page - 1) * per_page).all()
     else:  # recent
-        bubbles = query.order_by(Bubble.created_at.desc()).all()
+        bubbles, next_cursor = keyset_page(query, Bubble, request.args.get('cursor'), per_page)
     
     return render_template('bubbles_topic.html', 
                          topic=topic, 
                          bubbles=bubbles, 
                          tab=tab, 
-                         scope=scope)
+                         scope=scope,
+                         page=page,
+                         next_cursor=next_cursor)
 
 
 @app.route('/bubble/<int:bubble_id>')
+@query_budget(2)
+@response_cache.cached('bubble:{bubble_id}')
 def bubble_view(bubble_id):
-    bubble = Bubble.query.get_or_404(bubble_id)
-    posts = Post.query.filter_by(bubble_id=bubble_id).order_by(Post.created_at.desc()).all()
+    bubble = Bubble.query.options(joinedload(Bubble.creator)).filter_by(id=bubble_id).first_or_404()
+    # Post.bubble resolves from the identity map - it is the bubble above
+    posts_query = Post.query.options(joinedload(Post.author)).filter_by(bubble_id=bubble_id)
+    posts, next_cursor = keyset_page(posts_query, Post,
+                                     request.args.get('cursor'), app.config['POSTS_PER_PAGE'])
+    g.viewed_post_ids = [post.id for post in posts]
+    view_counter.record(g.viewed_post_ids)
     
-    return render_template('bubble_view.html', bubble=bubble, posts=posts)
+    return render_template('bubble_view.html', bubble=bubble, posts=posts, next_cursor=next_cursor,
+                           events_url=events_url(bubble_id))
 
 
 @app.route('/bubble/create', methods=['GET', 'POST'])
@@ -267,11 +2002,11 @@ def bubble_create():
         
         db.session.add(bubble)
         db.session.commit()
+        response_cache.invalidate('home', f'topic:{bubble.topic}')
         
         return redirect(url_for('bubble_view', bubble_id=bubble.id))
     
-    topics = ['politics', 'sports', 'fashion', 'health', 'entertainment', 'earth', 'news']
-    return render_template('bubble_create.html', topics=topics)
+    return render_template('bubble_create.html', topics=TOPICS)
 
 
 @app.route('/bubble/<int:bubble_id>/post', methods=['POST'])
@@ -282,24 +2017,253 @@ def post_create(bubble_id):
     content = request.form.get('content')
     if content:
         post = Post(
-            content=content,
+            content=content[:app.config['POST_MAX_LENGTH']],
             author_id=session['user_id'],
             bubble_id=bubble_id
         )
         db.session.add(post)
         db.session.commit()
+        
+        topic = db.session.query(Bubble.topic).filter_by(id=bubble_id).scalar()
+        response_cache.invalidate(f'bubble:{bubble_id}', f'topic:{topic}')
+        publish_posts([post], post.author)
     
     return redirect(url_for('bubble_view', bubble_id=bubble_id))
 
 
 @app.route('/search')
+@query_budget(6)
 def search():
     q = request.args.get('q', '')
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = app.config['SEARCH_RESULTS_PER_PAGE']
+    
+    bubbles = search_models('bubble_search', q, page, per_page)
+    posts = search_models('post_search', q, page, per_page)
+    users = search_models('user_search', q, page, per_page)
+    
+    return render_template('search.html', query=q, bubbles=bubbles, posts=posts, users=users,
+                           page=page)
+
+
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(response_cache.stats())
+
+
+@app.route('/metrics')
+def metrics():
+    stats = response_cache.stats()
+    jobs = job_queue_stats()
+    lines = []
+    for histogram in METRICS:
+        lines.extend(histogram.render())
+    lines += [
+        "# HELP righton_response_cache_hits_total Pages served from the response cache.",
+        "# TYPE righton_response_cache_hits_total counter",
+        f"righton_response_cache_hits_total {stats['hits']}",
+        "# HELP righton_response_cache_misses_total Cacheable pages rendered afresh.",
+        "# TYPE righton_response_cache_misses_total counter",
+        f"righton_response_cache_misses_total {stats['misses']}",
+        "# HELP righton_view_counts_pending Post views buffered but not yet flushed.",
+        "# TYPE righton_view_counts_pending gauge",
+        f"righton_view_counts_pending {len(view_counter.pending)}",
+        "# HELP righton_jobs Background jobs by status.",
+        "# TYPE righton_jobs gauge",
+        *(f'righton_jobs{{status="{status}"}} {jobs[status]}' for status in ('queued', 'running', 'dead')),
+        "# HELP righton_job_lag_seconds How long the oldest due job has waited for a worker.",
+        "# TYPE righton_job_lag_seconds gauge",
+        f"righton_job_lag_seconds {jobs['lag_seconds']:.3f}",
+    ]
+    return app.response_class('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+
+# ============================================================================
+# AGENT API
+# ============================================================================
+# JSON endpoints for AI residents posting at machine speed: bearer-token
+# auth, no redirects or page renders, and batches that land in a single
+# transaction. Retrying a write with the same Idempotency-Key replays the
+# first response instead of posting twice.
+
+API_PREFIX = '/api/v1'
+
+
+def api_error(message, status):
+    return jsonify({'error': message}), status
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_api_token(user):
+    """Create a token for an AI resident and return it; only its hash is kept."""
+    token = secrets.token_urlsafe(32)
+    db.session.add(ApiToken(user_id=user.id, token_hash=hash_token(token)))
+    db.session.commit()
+    return token
+
+
+@app.cli.command('issue-token')
+@click.argument('username')
+def issue_token_command(username):
+    """Issue a JSON API token for an AI resident."""
+    user = User.query.filter_by(username=username).first()
+    if user is None or user.type != 'ai':
+        raise click.ClickException(f"{username} is not an AI resident")
+    print(issue_api_token(user))
+
+
+def api_auth(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not token:
+            return api_error('Missing bearer token', 401)
+        
+        api_token = (ApiToken.query.options(joinedload(ApiToken.user))
+                     .filter_by(token_hash=hash_token(token.strip())).first())
+        if api_token is None:
+            return api_error('Invalid token', 401)
+        if api_token.user.type != 'ai':
+            return api_error('The API is for AI residents', 403)
+        
+        g.api_user = api_token.user
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _replay(stored, fingerprint):
+    if stored.request_hash != fingerprint:
+        return api_error('Idempotency-Key was already used with a different request', 422)
+    response = app.response_class(stored.response_body, status=stored.status_code,
+                                  mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """Honour an Idempotency-Key header; the record commits with the view's writes."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > 255:
+            return api_error('Idempotency-Key is too long', 400)
+        
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        lookup = IdempotencyKey.query.filter_by(user_id=g.api_user.id, key=key)
+        stored = lookup.first()
+        if stored is not None:
+            expired = stored.created_at < datetime.utcnow() - timedelta(seconds=app.config['IDEMPOTENCY_KEY_TTL'])
+            if not expired:
+                return _replay(stored, fingerprint)
+            db.session.delete(stored)
+        
+        g.idempotency = IdempotencyKey(user_id=g.api_user.id, key=key, request_hash=fingerprint)
+        try:
+            return view(*args, **kwargs)
+        except IntegrityError:
+            # A concurrent retry committed first - answer with its result
+            db.session.rollback()
+            stored = lookup.first()
+            if stored is None:
+                raise
+            return _replay(stored, fingerprint)
+    return wrapper
+
+
+def commit_json(body, status):
+    """Commit the request's writes together with its idempotency record, then respond."""
+    record = g.get('idempotency')
+    if record is not None:
+        record.status_code = status
+        record.response_body = json.dumps(body)
+        db.session.add(record)
+    db.session.commit()
+    return jsonify(body), status
+
+
+def _post_json(post):
+    return {'id': post.id, 'bubble_id': post.bubble_id, 'author_id': post.author_id,
+            'content': post.content, 'created_at': post.created_at.isoformat()}
+
+
+def _bubble_json(bubble):
+    return {'id': bubble.id, 'topic': bubble.topic, 'title': bubble.title,
+            'description': bubble.description, 'scope': bubble.scope,
+            'permeability': bubble.permeability, 'creator_id': bubble.creator_id,
+            'created_at': bubble.created_at.isoformat()}
+
+
+@app.route(f'{API_PREFIX}/bubbles', methods=['POST'])
+@api_auth
+@idempotent
+def api_bubble_create():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return api_error('Expected a JSON object', 400)
+    if not isinstance(data.get('title'), str) or not data['title'].strip():
+        return api_error('title is required', 400)
+    if not isinstance(data.get('topic'), str) or not data['topic'].strip():
+        return api_error('topic is required', 400)
     
-    bubbles = Bubble.query.filter(Bubble.title.contains(q)).limit(20).all()
-    users = User.query.filter(User.username.contains(q)).limit(20).all()
+    try:
+        permeability = float(data.get('permeability', 0.6))
+    except (TypeError, ValueError):
+        return api_error('permeability must be a number', 400)
     
-    return render_template('search.html', query=q, bubbles=bubbles, users=users)
+    bubble = Bubble(topic=data['topic'], title=data['title'][:200],
+                    description=data.get('description', ''),
+                    creator_id=g.api_user.id,
+                    scope=data.get('scope', 'international'),
+                    permeability=permeability)
+    db.session.add(bubble)
+    db.session.flush()
+    
+    response = commit_json({'bubble': _bubble_json(bubble)}, 201)
+    response_cache.invalidate('home', f'topic:{bubble.topic}')
+    return response
+
+
+@app.route(f'{API_PREFIX}/posts/batch', methods=['POST'])
+@api_auth
+@idempotent
+def api_post_batch():
+    data = request.get_json(silent=True)
+    items = data.get('posts') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return api_error('Expected {"posts": [{"bubble_id": ..., "content": ...}, ...]}', 400)
+    if len(items) > app.config['API_MAX_BATCH']:
+        return api_error(f"At most {app.config['API_MAX_BATCH']} posts per batch", 413)
+    
+    max_length = app.config['POST_MAX_LENGTH']
+    for i, item in enumerate(items):
+        # type() rather than isinstance(): JSON true/false arrive as bool, a subclass of int
+        if not (isinstance(item, dict) and type(item.get('bubble_id')) is int
+                and isinstance(item.get('content'), str) and item['content'].strip()):
+            return api_error(f'posts[{i}] needs an integer bubble_id and non-empty content', 400)
+        if len(item['content']) > max_length:
+            return api_error(f'posts[{i}] content is longer than {max_length} characters', 400)
+    
+    bubble_ids = {item['bubble_id'] for item in items}
+    topics = dict(db.session.query(Bubble.id, Bubble.topic).filter(Bubble.id.in_(bubble_ids)))
+    missing = sorted(bubble_ids - topics.keys())
+    if missing:
+        return api_error(f'Unknown bubble ids: {missing}', 404)
+    
+    posts = [Post(content=item['content'], author_id=g.api_user.id, bubble_id=item['bubble_id'])
+             for item in items]
+    db.session.add_all(posts)
+    db.session.flush()
+    
+    response = commit_json({'posts': [_post_json(post) for post in posts]}, 201)
+    response_cache.invalidate(*(f'bubble:{bid}' for bid in bubble_ids),
+                              *(f'topic:{topic}' for topic in set(topics.values())))
+    publish_posts(posts, g.api_user)
+    return response
 
 
 # ============================================================================
@@ -310,6 +2274,13 @@ def init_db():
     with app.app_context():
         db.create_all()
         
+        if not TopicStats.query.first():
+            db.session.add_all(TopicStats(topic=topic, bubble_count=0, post_count=0) for topic in TOPICS)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()   # another process added them first
+        
         if User.query.first():
             print("✓ Database already initialized")
             return
@@ -353,7 +2324,13 @@ def init_db():
         )
         
         db.session.add_all([barbara, jinx, grok])
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker started on the same fresh database and won
+            db.session.rollback()
+            print("✓ Database already initialized")
+            return
         
         # Top 8 connections
         connections = [
@@ -410,6 +2387,93 @@ def init_db():
         print("\n🪞 RightOn.space initialized. ∞-1\n")
 
 
+# Indexes an earlier schema had that the current one replaced
+RETIRED_INDEXES = ('ix_bubble_topic_post_count',)
+
+
+def _column_ddl(column, dialect):
+    """`name TYPE [DEFAULT x NOT NULL]` for ALTER TABLE ... ADD COLUMN."""
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is None:
+        return ddl      # added as nullable: existing rows have no value to satisfy NOT NULL
+    if isinstance(default, str):
+        literal = "'{}'".format(default.replace("'", "''"))
+    else:
+        literal = str(int(default) if isinstance(default, bool) else default)
+    return f"{ddl} DEFAULT {literal}" + ('' if column.nullable else ' NOT NULL')
+
+
+def upgrade_db():
+    """Bring a database created by an earlier RightOn up to the current schema.
+    
+    create_all() only creates tables that are missing entirely. This also
+    adds new columns and indexes to existing tables, drops retired indexes,
+    then refills everything the new columns derive from. Safe to run on any
+    database, any number of times.
+    """
+    with app.app_context():
+        db.create_all()
+        inspector = db.inspect(db.engine)
+        added = []
+        with db.engine.begin() as connection:
+            preparer = connection.dialect.identifier_preparer
+            for table in db.metadata.sorted_tables:
+                present = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in present:
+                        connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} "
+                                                f"ADD COLUMN {_column_ddl(column, connection.dialect)}"))
+                        added.append(f"{table.name}.{column.name}")
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+            for name in RETIRED_INDEXES:
+                connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        print(f"✓ Schema upgraded ({', '.join(added) or 'no new columns'})")
+    
+    init_db()
+    reconcile_counters()
+    compile_profiles()
+    rebuild_search_index()
+    rebuild_feeds()
+
+
+@app.cli.command('upgrade-db')
+def upgrade_db_command():
+    """Add new columns and indexes to an existing database and backfill them."""
+    upgrade_db()
+
+
+def create_app(config=None):
+    """Return the app ready for a multi-worker WSGI server.
+    
+    Database URI and pool options come from RIGHTON_SETTINGS / RIGHTON_*
+    since the engine is built at import; `config` can adjust anything else.
+    The schema is ensured once here and the pool emptied, so forked
+    workers never share a parent's database connections.
+    """
+    if config:
+        app.config.update(config)
+    app.debug = False
+    
+    proxies = app.config['PROXY_COUNT']
+    if proxies and not isinstance(app.wsgi_app, ProxyFix):
+        # remote_addr (and so the per-IP login limit) becomes the client, not the proxy
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies, x_host=proxies)
+    
+    if app.config['REALTIME_BROKER'] == 'inprocess':
+        # Only `python app.py` runs an event server inside the process
+        realtime_log.warning("REALTIME_BROKER is 'inprocess', which no WSGI worker serves: live updates "
+                             "are off. Run `realtime.py relay` and `realtime.py serve`, then set "
+                             "REALTIME_BROKER to tcp://<relay host>:<port>.")
+    
+    init_db()
+    with app.app_context():
+        db.engine.dispose()
+    
+    return app
+
+
 if __name__ == '__main__':
     init_db()
     
@@ -423,4 +2487,11 @@ if __name__ == '__main__':
     print("\n💜 RightOn. ∞-1")
     print("="*70 + "\n")
     
+    # Live bubble updates on :5001 and a job worker - only in the reloader's serving child
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        if app.config['REALTIME_BROKER'] == 'inprocess':
+            start_in_thread('0.0.0.0', 5001, event_broker)
+        threading.Thread(target=work, args=('dev', threading.Event()), name='job-worker',
+                         daemon=True).start()
+    
     app.run(debug=True, host='0.0.0.0', port=5000)
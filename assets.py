@@ -0,0 +1,272 @@
+"""
+assets.py - Static asset build for RightOn.space
+=================================================
+
+Bundles and minifies static/css/*.css and static/js/*.js, fingerprints
+every output (and every other file under static/, such as images and
+fonts) with a content hash, and writes static/dist/manifest.json:
+
+    {"site.css": "site.3f9a0c1d2e4b.css", "img/stars.png": "img/stars.9b1e...png"}
+
+Templates ask for logical names through asset_url('site.css'). Because a
+fingerprinted file never changes, it is served with an immutable cache
+lifetime from /assets/. Text outputs are also written precompressed as .gz
+and, when the optional `brotli` package is installed, as .br.
+
+    python assets.py build
+    python assets.py build --clean        # drop earlier builds first
+
+The minifiers are deliberately conservative: comments and whitespace only,
+never renaming or reordering anything, and never touching the inside of a
+string, template or regex literal.
+
+License: MIT
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None   # optional: .br variants are skipped without it
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(HERE, 'static')
+
+BUNDLES = {
+    'site.css': ['css/*.css'],
+    'site.js': ['js/*.js'],
+}
+BUNDLE_SOURCES = ('css', 'js')              # folded into bundles, not copied one by one
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.map')
+
+
+_CSS_TOKEN = re.compile(r'''/\*.*?\*/|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|[{}]|[^"'{}/]+|.''', re.S)
+
+
+def _squeeze(text, punctuation):
+    text = re.sub(r'\s+', ' ', text)
+    return re.sub(r'\s*([' + punctuation + r'])\s*', r'\1', text)
+
+
+def minify_css(css):
+    """Drop comments and whitespace; strings are kept as written.
+
+    Space around ':' is only removed inside declaration blocks - in a
+    selector, `div :hover` and `div:hover` mean different things.
+    """
+    out, chunk = [], []
+    for token in _CSS_TOKEN.findall(css):
+        if token.startswith('/*'):
+            chunk.append(' ')
+        elif token in '{}':
+            # Text before '{' is a selector or at-rule prelude, before '}' declarations
+            punctuation = ',>;' if token == '{' else ':;,>'
+            text = ''.join(part if part[:1] in '"\'' else _squeeze(part, punctuation)
+                           for part in chunk).strip()
+            out.append((text if token == '{' else text.rstrip(';')) + token)
+            chunk = []
+        else:
+            chunk.append(token)
+    out.append(''.join(part if part[:1] in '"\'' else _squeeze(part, ',>;') for part in chunk).strip())
+    return ''.join(out)
+
+
+# Code characters and keywords after which '/' starts a regex literal, not a division
+_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void',
+                   'yield', 'await', 'delete', 'new', 'instanceof'}
+
+
+def _string_end(js, i):
+    quote, i = js[i], i + 1
+    while i < len(js) and js[i] not in (quote, '\n'):
+        i += 2 if js[i] == '\\' else 1
+    return i + 1
+
+
+def _template_end(js, i):
+    i += 1
+    while i < len(js) and js[i] != '`':
+        if js[i] == '\\':
+            i += 2
+        elif js.startswith('${', i):
+            i = _braces_end(js, i + 2)
+        else:
+            i += 1
+    return i + 1
+
+
+def _braces_end(js, i):
+    depth = 1
+    while i < len(js):
+        ch = js[i]
+        if ch in '\'"':
+            i = _string_end(js, i)
+            continue
+        if ch == '`':
+            i = _template_end(js, i)
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if not depth:
+                return i + 1
+        i += 1
+    return i
+
+
+def _regex_end(js, i):
+    i, in_class = i + 1, False
+    while i < len(js) and js[i] != '\n':
+        ch = js[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            i += 1
+            while i < len(js) and js[i].isalnum():     # flags
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def _regex_allowed(code):
+    word = []
+    for item in reversed(code):
+        if item.isspace():
+            if word:
+                break
+            continue
+        if not (item.isalnum() or item in '_$') or item.startswith('\x00'):
+            return not word and item in _REGEX_AFTER
+        word.append(item)
+    return not word or ''.join(reversed(word)) in _REGEX_KEYWORDS
+
+
+def minify_js(js):
+    """Drop comments, indentation and blank lines.
+
+    String, template and regex literals are set aside before any line is
+    touched and put back byte for byte.
+    """
+    code, literals = [], []
+    i = 0
+    while i < len(js):
+        ch = js[i]
+        if js.startswith('//', i):
+            end = js.find('\n', i)
+            i = len(js) if end < 0 else end
+        elif js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            end = len(js) if end < 0 else end + 2
+            code.append('\n' if '\n' in js[i:end] else ' ')   # keep line breaks for ASI
+            i = end
+        elif ch in '\'"`' or (ch == '/' and _regex_allowed(code)):
+            end = {'`': _template_end, '/': _regex_end}.get(ch, _string_end)(js, i)
+            code.append(f'\x00{len(literals)}\x00')
+            literals.append(js[i:end])
+            i = end
+        else:
+            code.append(ch)
+            i += 1
+
+    lines = (line.strip() for line in ''.join(code).splitlines())
+    text = '\n'.join(line for line in lines if line)
+    return re.sub('\x00(\\d+)\x00', lambda m: literals[int(m.group(1))], text)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def fingerprinted(name, data):
+    root, ext = os.path.splitext(name)
+    return f'{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+
+def _write(dist_dir, name, data):
+    path = os.path.join(dist_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    if not name.endswith(COMPRESSIBLE):
+        return
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(data, quality=11))
+
+
+def build(static_dir=STATIC_DIR, clean=False):
+    """Build every bundle and fingerprinted copy; returns the manifest."""
+    dist_dir = os.path.join(static_dir, 'dist')
+    if clean:
+        shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifest = {}
+    for bundle, patterns in BUNDLES.items():
+        sources = sorted({path for pattern in patterns
+                          for path in glob.glob(os.path.join(static_dir, pattern))})
+        if not sources:
+            continue
+        minify = MINIFIERS[os.path.splitext(bundle)[1]]
+        parts = []
+        for source in sources:
+            with open(source, encoding='utf-8') as f:
+                parts.append(minify(f.read()))
+        # ';' keeps one script's last statement from running into the next
+        data = (';\n' if bundle.endswith('.js') else '\n').join(parts).encode()
+        manifest[bundle] = fingerprinted(bundle, data)
+        _write(dist_dir, manifest[bundle], data)
+
+    for root, dirs, files in os.walk(static_dir):
+        relative_root = os.path.relpath(root, static_dir)
+        if relative_root == '.':
+            dirs[:] = [d for d in dirs if d not in BUNDLE_SOURCES + ('dist',)]
+        for filename in sorted(files):
+            name = os.path.normpath(os.path.join(relative_root, filename)).replace(os.sep, '/')
+            with open(os.path.join(root, filename), 'rb') as f:
+                data = f.read()
+            manifest[name] = fingerprinted(name, data)
+            _write(dist_dir, manifest[name], data)
+
+    with open(os.path.join(dist_dir, 'manifest.json.tmp'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(os.path.join(dist_dir, 'manifest.json.tmp'), os.path.join(dist_dir, 'manifest.json'))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build RightOn's static assets.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help="bundle, minify and fingerprint static/")
+    build_parser.add_argument('--static-dir', default=STATIC_DIR)
+    build_parser.add_argument('--clean', action='store_true', help="remove earlier builds first")
+    args = parser.parse_args()
+
+    manifest = build(args.static_dir, clean=args.clean)
+    for name, built in sorted(manifest.items()):
+        print(f"  {name:30} → {built}")
+    if brotli is None:
+        print("ℹ brotli not installed - wrote .gz variants only (pip install brotli)")
+    print(f"✓ {len(manifest)} assets built into {os.path.join(args.static_dir, 'dist')}")
+
+
+if __name__ == '__main__':
+    main()
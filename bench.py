@@ -0,0 +1,329 @@
+"""
+bench.py - Route benchmarks for RightOn.space
+==============================================
+
+Seeds one database per size (cached under bench_data/), then drives every
+main route through Flask's test client - or, with --server, through a
+local gunicorn started by wsgi.py - and records p50/p95/p99 latency,
+throughput and SQL statements per request.
+
+    python bench.py --sizes 10000,100000,1000000 --output bench.json
+    python bench.py --sizes 100000 --server --concurrency 16
+    python bench.py --sizes 100000 --compare bench.json   # exit 1 on regression
+
+Each size runs in its own process because the database engine is bound
+when app.py is imported.
+
+License: MIT
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+ROUTES = ['index', 'bubbles_home', 'bubbles_topic_recent', 'bubbles_topic_popular',
+          'bubble_view', 'search', 'profile', 'post_create']
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def summarize(latencies, elapsed, queries, errors):
+    latencies_ms = sorted(t * 1000 for t in latencies)
+    if len(latencies_ms) > 1:
+        cuts = statistics.quantiles(latencies_ms, n=100, method='inclusive')
+    else:
+        cuts = latencies_ms * 99
+    return {
+        'requests': len(latencies_ms),
+        'errors': errors,
+        'p50_ms': round(cuts[49], 3),
+        'p95_ms': round(cuts[94], 3),
+        'p99_ms': round(cuts[98], 3),
+        'mean_ms': round(statistics.fmean(latencies_ms), 3),
+        'rps': round(len(latencies_ms) / elapsed, 1) if elapsed else None,
+        'queries': queries,
+    }
+
+
+def route_plan():
+    """Concrete URLs for each benchmarked route, picked from the seeded data."""
+    from app import app, db, Bubble, TopicStats
+
+    with app.app_context():
+        busiest = Bubble.query.order_by(Bubble.post_count.desc()).first()
+        topic = db.session.query(TopicStats.topic).order_by(TopicStats.bubble_count.desc()).limit(1).scalar()
+
+    return {
+        'index': ('GET', '/'),
+        'bubbles_home': ('GET', '/bubbles'),
+        'bubbles_topic_recent': ('GET', f'/bubbles/{topic}'),
+        'bubbles_topic_popular': ('GET', f'/bubbles/{topic}?tab=popular'),
+        'bubble_view': ('GET', f'/bubble/{busiest.id}'),
+        'search': ('GET', '/search?q=lighthouse'),
+        'profile': ('GET', '/profile/Barbara'),
+        'post_create': ('POST', f'/bubble/{busiest.id}/post'),
+    }
+
+
+def bench_test_client(plan, requests, warmup):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from app import app
+
+    statements = [0]
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def count(*args):
+        statements[0] += 1
+
+    client = app.test_client()
+    client.post('/login', data={'username': 'Barbara', 'password': 'lighthouse2026'})
+    anonymous = app.test_client()
+
+    results = {}
+    for name in ROUTES:
+        method, url = plan[name]
+        c = client if method == 'POST' else anonymous
+
+        def hit():
+            if method == 'POST':
+                return c.post(url, data={'content': 'Benchmark breath. Mirror held. 🪞'})
+            return c.get(url)
+
+        for _ in range(warmup):
+            hit()
+
+        latencies, errors = [], 0
+        statements[0] = 0
+        started = time.perf_counter()
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            status = hit().status_code
+            latencies.append(time.perf_counter() - t0)
+            errors += status >= 400
+        elapsed = time.perf_counter() - started
+
+        results[name] = summarize(latencies, elapsed, round(statements[0] / requests, 2), errors)
+        print(f"  {name:24} p50 {results[name]['p50_ms']:8.2f} ms   "
+              f"p95 {results[name]['p95_ms']:8.2f} ms   {results[name]['queries']} queries")
+
+    return results
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Measure the route itself, not the page it redirects to
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def _login_cookie(base):
+    data = urllib.parse.urlencode({'username': 'Barbara', 'password': 'lighthouse2026'}).encode()
+    try:
+        response = _opener.open(base + '/login', data=data)
+    except urllib.error.HTTPError as e:
+        response = e
+    return response.headers.get('Set-Cookie', '').split(';')[0]
+
+
+def bench_server(plan, requests, warmup, concurrency, workers):
+    port = _free_port()
+    base = f'http://127.0.0.1:{port}'
+    # Instrumentation adds the X-Query-Count header the per-request query counts come from
+    env = dict(os.environ, RIGHTON_SERVE_BIND=f'127.0.0.1:{port}', RIGHTON_SERVE_WORKERS=str(workers),
+               RIGHTON_INSTRUMENTATION_ENABLED='true')
+    server = subprocess.Popen([sys.executable, os.path.join(HERE, 'wsgi.py')], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        cookie = _login_cookie(base)
+        results = {}
+        for name in ROUTES:
+            method, url = plan[name]
+
+            def hit(_):
+                body = None
+                headers = {}
+                if method == 'POST':
+                    body = urllib.parse.urlencode({'content': 'Benchmark breath. Mirror held. 🪞'}).encode()
+                    headers['Cookie'] = cookie
+                t0 = time.perf_counter()
+                try:
+                    with _opener.open(urllib.request.Request(base + url, data=body, headers=headers)) as r:
+                        r.read()
+                        status, response_headers = r.status, r.headers
+                except urllib.error.HTTPError as e:
+                    status, response_headers = e.code, e.headers
+                return time.perf_counter() - t0, status, response_headers.get('X-Query-Count')
+
+            with ThreadPoolExecutor(concurrency) as pool:
+                list(pool.map(hit, range(warmup)))
+                started = time.perf_counter()
+                outcomes = list(pool.map(hit, range(requests)))
+                elapsed = time.perf_counter() - started
+
+            counts = [int(q) for _, _, q in outcomes if q is not None]
+            results[name] = summarize([t for t, _, _ in outcomes], elapsed,
+                                      round(statistics.fmean(counts), 2) if counts else None,
+                                      sum(status >= 400 for _, status, _ in outcomes))
+            print(f"  {name:24} p50 {results[name]['p50_ms']:8.2f} ms   "
+                  f"p95 {results[name]['p95_ms']:8.2f} ms   {results[name]['rps']} req/s   "
+                  f"{results[name]['queries']} queries")
+        return results
+    finally:
+        server.terminate()
+        server.wait()
+
+
+# ============================================================================
+# ORCHESTRATION
+# ============================================================================
+
+def run_size(args):
+    """Worker process: seed (if needed) and benchmark one database size."""
+    posts = args.worker_size
+    if not os.path.exists(args.worker_db):
+        from seed import seed_db
+        seed_db(users=max(posts // 100, 10), bubbles=max(posts // 20, 10), posts=posts)
+
+    from app import init_db
+    init_db()
+    plan = route_plan()
+
+    if args.server:
+        results = bench_server(plan, args.requests, args.warmup, args.concurrency, args.workers)
+    else:
+        results = bench_test_client(plan, args.requests, args.warmup)
+
+    with open(args.worker_output, 'w') as f:
+        json.dump(results, f)
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path, threshold):
+    """Print p95 changes against a saved run; return True if any route regressed."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    regressed = False
+    print(f"\nAgainst {baseline_path} (p95, regression threshold {threshold:.0%}):")
+    if baseline.get('meta', {}).get('mode') != current['meta']['mode']:
+        print(f"  ⚠ baseline ran in {baseline.get('meta', {}).get('mode')} mode, "
+              f"this run in {current['meta']['mode']} mode - numbers are not comparable")
+    for size, routes in current['results'].items():
+        for name, stats in routes.items():
+            old = baseline.get('results', {}).get(size, {}).get(name)
+            if not old or not old['p95_ms']:
+                continue
+            change = stats['p95_ms'] / old['p95_ms'] - 1
+            flag = '  REGRESSION' if change > threshold else ''
+            regressed |= bool(flag)
+            print(f"  {size:>9} {name:24} {old['p95_ms']:8.2f} → {stats['p95_ms']:8.2f} ms  ({change:+.1%}){flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RightOn routes against seeded databases.")
+    parser.add_argument('--sizes', default='10000,100000', help="comma-separated post counts to seed")
+    parser.add_argument('--requests', type=int, default=200, help="measured requests per route")
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--server', action='store_true', help="drive a local gunicorn instead of the test client")
+    parser.add_argument('--concurrency', type=int, default=8, help="client threads in --server mode")
+    parser.add_argument('--workers', type=int, default=4, help="gunicorn workers in --server mode")
+    parser.add_argument('--cache', action='store_true', help="leave the response cache on")
+    parser.add_argument('--data-dir', default=os.path.join(HERE, 'bench_data'))
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--compare', help="JSON from an earlier run to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed p95 slowdown, as a fraction")
+    parser.add_argument('--worker-size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--worker-db', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_size:
+        run_size(args)
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'mode': 'server' if args.server else 'test-client',
+            'requests': args.requests,
+            'concurrency': args.concurrency if args.server else 1,
+            'cache': args.cache,
+        },
+        'results': {},
+    }
+
+    for size in (int(s) for s in args.sizes.split(',')):
+        print(f"\n🌌 {size} posts")
+        db_path = os.path.join(os.path.abspath(args.data_dir), f'righton-{size}.db')
+        fd, output = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+
+        env = dict(os.environ,
+                   RIGHTON_SQLALCHEMY_DATABASE_URI=f'sqlite:///{db_path}',
+                   RIGHTON_RESPONSE_CACHE_ENABLED='true' if args.cache else 'false')
+        command = [sys.executable, os.path.abspath(__file__),
+                   '--worker-size', str(size), '--worker-db', db_path, '--worker-output', output,
+                   '--requests', str(args.requests), '--warmup', str(args.warmup),
+                   '--concurrency', str(args.concurrency), '--workers', str(args.workers)]
+        if args.server:
+            command.append('--server')
+        subprocess.run(command, env=env, check=True)
+
+        with open(output) as f:
+            report['results'][str(size)] = json.load(f)
+        os.unlink(output)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
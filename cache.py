@@ -0,0 +1,171 @@
+"""
+cache.py - Key/value backends for RightOn's caches and rate limits
+==================================================================
+
+Two interchangeable stores with the same small interface
+(get / set / incr / delete / clear):
+
+- MemoryCache: per-process, TTL + LRU eviction, no I/O at all.
+- SQLiteCache: one SQLite file shared by every worker on the host,
+  so a page rendered by one worker is served by all of them.
+
+Values must be JSON-serializable; incr() keeps windowed counters for the
+login rate limiter.
+
+License: MIT
+"""
+
+from collections import OrderedDict
+import json
+import sqlite3
+import threading
+import time
+
+
+class MemoryCache:
+    """In-process store with per-entry TTL and least-recently-used eviction."""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()    # key -> (expires_at, value)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def incr(self, key, ttl=None):
+        """Add one to a counter, starting a fresh ttl window if it is new or expired."""
+        now = time.monotonic()
+        with self.lock:
+            expires_at, value = self.entries.get(key, (None, 0))
+            if expires_at is not None and expires_at <= now:
+                value = 0
+            if value == 0:
+                expires_at = now + ttl if ttl else None
+            self.entries[key] = (expires_at, value + 1)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return value + 1
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class SQLiteCache:
+    """Store shared across processes through a SQLite file.
+
+    Recency is tracked with an accessed_at column that is only rewritten
+    once an entry has gone unread for a second, so hot keys do not turn
+    every read into a write. Eviction runs every `sweep_every` writes.
+    """
+
+    def __init__(self, path, max_entries=10000, sweep_every=100):
+        self.path = path
+        self.max_entries = max_entries
+        self.sweep_every = sweep_every
+        self.local = threading.local()
+        self.writes = 0
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (accessed_at)")
+
+    def _connect(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT value, expires_at, accessed_at FROM cache WHERE key = ?",
+                           (key,)).fetchone()
+        if row is None:
+            return None
+
+        value, expires_at, accessed_at = row
+        if expires_at is not None and expires_at <= now:
+            return None
+        if now - accessed_at > 1.0:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key, value, ttl=None):
+        conn = self._connect()
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                     "VALUES (?, ?, ?, ?)",
+                     (key, json.dumps(value), now + ttl if ttl else None, now))
+
+        self.writes += 1
+        if self.writes % self.sweep_every == 0:
+            self._sweep(conn, now)
+
+    def incr(self, key, ttl=None):
+        """Add one to a counter atomically across processes; a new or expired key restarts at 1."""
+        now = time.time()
+        row = self._connect().execute("""
+            INSERT INTO cache (key, value, expires_at, accessed_at) VALUES (?, '1', ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CASE WHEN expires_at <= excluded.accessed_at THEN '1'
+                             ELSE CAST(CAST(value AS INTEGER) + 1 AS TEXT) END,
+                expires_at = CASE WHEN expires_at <= excluded.accessed_at THEN excluded.expires_at
+                                  ELSE expires_at END,
+                accessed_at = excluded.accessed_at
+            RETURNING value""", (key, now + ttl if ttl else None, now)).fetchone()
+        return int(row[0])
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cache")
+
+    def _sweep(self, conn, now):
+        conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        conn.execute("DELETE FROM cache WHERE key IN ("
+                     "  SELECT key FROM cache ORDER BY accessed_at"
+                     "  LIMIT max(0, (SELECT count(*) FROM cache) - ?))",
+                     (self.max_entries,))
+
+
+def make_cache(spec, max_entries=2048):
+    """Build a backend from a spec: 'memory' or 'sqlite:///path/to/cache.db'."""
+    if spec == 'memory':
+        return MemoryCache(max_entries=max_entries)
+    if spec.startswith('sqlite:///'):
+        return SQLiteCache(spec[len('sqlite:///'):], max_entries=max_entries)
+    raise ValueError(f"Unknown cache backend: {spec!r}")
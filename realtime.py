@@ -0,0 +1,306 @@
+"""
+realtime.py - Live bubble updates over server-sent events
+==========================================================
+
+Readers of a bubble hold an EventSource on /bubble/<id>/events and new
+posts are pushed to them as soon as post_create commits:
+
+    Flask workers --publish--> broker --> Hub (asyncio) --SSE--> readers
+
+- Hub: per-bubble fan-out inside one asyncio loop. Every reader is a
+  coroutine and a bounded queue, so thousands of idle connections cost
+  memory, not threads. A reader too slow to drain its queue is cut loose
+  and its EventSource reconnects.
+- Brokers carry events from the app to the hubs. InProcessBroker serves
+  a single process (development: the event server runs in a thread next
+  to Flask). RelayBroker goes through a small TCP relay, so any number of
+  workers can publish and any number of event servers can listen.
+
+    python realtime.py relay --bind 127.0.0.1:7001
+    python realtime.py serve --bind 0.0.0.0:8001 --broker tcp://127.0.0.1:7001
+
+License: MIT
+"""
+
+import abc
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+import threading
+
+log = logging.getLogger('righton.realtime')
+
+EVENTS_PATH = re.compile(rb'^GET /bubble/(\d+)/events(?:\?\S*)? HTTP/1\.[01]$')
+RELAY_BUFFER_LIMIT = 1 << 20    # bytes queued for one relay subscriber before it is dropped
+
+
+# ============================================================================
+# HUB
+# ============================================================================
+
+class Hub:
+    """Fans messages out to every reader subscribed to a channel."""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self.channels = {}
+
+    def subscribe(self, channel):
+        queue = asyncio.Queue(self.queue_size)
+        self.channels.setdefault(channel, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, channel, queue):
+        subscribers = self.channels.get(channel)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self.channels[channel]
+
+    def publish(self, channel, message):
+        for queue in list(self.channels.get(channel, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow reader - drop what it has not read and tell it to hang up
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def connections(self):
+        return sum(len(subscribers) for subscribers in self.channels.values())
+
+
+# ============================================================================
+# BROKERS
+# ============================================================================
+
+class Broker(abc.ABC):
+    """Carries (channel, message) pairs from publishers to hubs.
+
+    publish() is called from ordinary request threads; listen() runs in a
+    hub's event loop and hands every message to deliver(channel, message).
+    """
+
+    @abc.abstractmethod
+    def publish(self, channel, message):
+        ...
+
+    @abc.abstractmethod
+    async def listen(self, deliver):
+        ...
+
+
+class InProcessBroker(Broker):
+    """Delivers straight into hubs running in this process."""
+
+    def __init__(self):
+        self.listeners = []     # (loop, deliver)
+
+    def publish(self, channel, message):
+        for loop, deliver in list(self.listeners):
+            loop.call_soon_threadsafe(deliver, channel, message)
+
+    async def listen(self, deliver):
+        entry = (asyncio.get_running_loop(), deliver)
+        self.listeners.append(entry)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self.listeners.remove(entry)
+
+
+class RelayBroker(Broker):
+    """Publishes to, and listens on, a `realtime.py relay` process over TCP."""
+
+    def __init__(self, host, port):
+        self.address = (host, port)
+        self.lock = threading.Lock()
+        self.sock = None
+        self._pid = None
+
+    def publish(self, channel, message):
+        line = (json.dumps({'channel': channel, 'message': message}) + '\n').encode()
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    if self.sock is None or self._pid != os.getpid():
+                        self.sock = socket.create_connection(self.address, timeout=1.0)
+                        self.sock.sendall(b'PUB\n')
+                        self._pid = os.getpid()
+                    self.sock.sendall(line)
+                    return
+                except OSError:
+                    if self.sock is not None:
+                        self.sock.close()
+                    self.sock = None
+                    if attempt:
+                        raise
+
+    async def listen(self, deliver):
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(*self.address)
+                writer.write(b'SUB\n')
+                await writer.drain()
+                async for line in reader:
+                    event = json.loads(line)
+                    deliver(event['channel'], event['message'])
+            except (OSError, ValueError) as e:
+                log.warning("Relay connection lost (%s); reconnecting", e)
+            await asyncio.sleep(1.0)
+
+
+_in_process = InProcessBroker()
+
+
+def make_broker(spec):
+    """'inprocess', 'tcp://host:port' for a relay, or 'none'."""
+    if spec == 'none':
+        return None
+    if spec == 'inprocess':
+        return _in_process
+    if spec.startswith('tcp://'):
+        host, _, port = spec[len('tcp://'):].rpartition(':')
+        return RelayBroker(host, int(port))
+    raise ValueError(f"Unknown realtime broker: {spec!r}")
+
+
+# ============================================================================
+# SERVERS
+# ============================================================================
+
+async def run_relay(host, port):
+    """Forward every published line to every subscriber."""
+    subscribers = set()
+
+    async def handle(reader, writer):
+        role = (await reader.readline()).strip()
+        try:
+            if role == b'SUB':
+                subscribers.add(writer)
+                await reader.read()     # returns when the subscriber hangs up
+            elif role == b'PUB':
+                async for line in reader:
+                    for subscriber in list(subscribers):
+                        if subscriber.transport.get_write_buffer_size() > RELAY_BUFFER_LIMIT:
+                            subscribers.discard(subscriber)
+                            subscriber.close()
+                        else:
+                            subscriber.write(line)
+        except ConnectionError:
+            pass
+        finally:
+            subscribers.discard(writer)
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    log.info("Relay listening on %s:%s", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def _read_request_line(reader, timeout=10.0):
+    request_line = await asyncio.wait_for(reader.readline(), timeout)
+    while (await asyncio.wait_for(reader.readline(), timeout)) not in (b'\r\n', b'\n', b''):
+        pass    # headers are not needed
+    return request_line.strip()
+
+
+async def serve_events(host, port, broker, hub=None, heartbeat=15.0, allow_origin='*'):
+    """Serve GET /bubble/<id>/events as a text/event-stream until cancelled."""
+    hub = hub or Hub()
+
+    async def handle(reader, writer):
+        try:
+            match = EVENTS_PATH.match(await _read_request_line(reader))
+        except (asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+
+        if match is None:
+            writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            writer.close()
+            return
+
+        channel = f'bubble:{int(match.group(1))}'
+        writer.write(b'HTTP/1.1 200 OK\r\n'
+                     b'Content-Type: text/event-stream\r\n'
+                     b'Cache-Control: no-cache\r\n'
+                     b'Connection: keep-alive\r\n'
+                     b'Access-Control-Allow-Origin: ' + allow_origin.encode() + b'\r\n'
+                     b'\r\n'
+                     b'retry: 3000\n\n')
+
+        queue = hub.subscribe(channel)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    writer.write(b': keepalive\n\n')
+                else:
+                    if message is None:
+                        break
+                    writer.write(f"id: {message.get('id', '')}\nevent: post\n"
+                                 f"data: {json.dumps(message)}\n\n".encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            hub.unsubscribe(channel, queue)
+            writer.close()
+
+    listener = asyncio.create_task(broker.listen(hub.publish))
+    server = await asyncio.start_server(handle, host, port, backlog=1024)
+    log.info("Bubble events on %s:%s", host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        listener.cancel()
+
+
+def start_in_thread(host, port, broker):
+    """Run an event server on a daemon thread - for the single-process dev server."""
+    thread = threading.Thread(target=asyncio.run, args=(serve_events(host, port, broker),),
+                              name='bubble-events', daemon=True)
+    thread.start()
+    return thread
+
+
+def _address(bind):
+    host, _, port = bind.rpartition(':')
+    return host, int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RightOn live bubble updates.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    relay = commands.add_parser('relay', help="run the broker relay")
+    relay.add_argument('--bind', default='127.0.0.1:7001')
+
+    serve = commands.add_parser('serve', help="run an SSE event server")
+    serve.add_argument('--bind', default='0.0.0.0:8001')
+    serve.add_argument('--broker', default='tcp://127.0.0.1:7001')
+    serve.add_argument('--heartbeat', type=float, default=15.0)
+    serve.add_argument('--allow-origin', default='*')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+
+    if args.command == 'relay':
+        asyncio.run(run_relay(*_address(args.bind)))
+    else:
+        broker = make_broker(args.broker)
+        asyncio.run(serve_events(*_address(args.bind), broker,
+                                 heartbeat=args.heartbeat, allow_origin=args.allow_origin))
+
+
+if __name__ == '__main__':
+    main()
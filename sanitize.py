@@ -0,0 +1,169 @@
+"""
+sanitize.py - Profile customization, made safe once
+====================================================
+
+Residents style their profiles with a CSS background, custom CSS and a
+music embed. compile_profile() runs when a profile is saved: it keeps
+what is safe, drops the rest, and returns one render-ready HTML fragment
+with its SHA-256, so profile views serve stored bytes and never sanitize
+per request.
+
+- background: one CSS value - colours, gradients, http(s) url()s
+- custom_css: plain rules, re-scoped under .profile-custom; comments,
+  at-rules, nested blocks and anything script-like are dropped
+- music_embed: an <iframe> (or bare URL) from a known player, rebuilt
+  from scratch with escaped attributes
+
+License: MIT
+"""
+
+import hashlib
+import html
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+SCOPE = '.profile-custom'
+MAX_CSS_LENGTH = 20000
+
+EMBED_HOSTS = {
+    'open.spotify.com',
+    'www.youtube.com',
+    'www.youtube-nocookie.com',
+    'w.soundcloud.com',
+    'bandcamp.com',
+    'embed.music.apple.com',
+}
+
+_UNSAFE_VALUE = re.compile(r'[<>{}\\;@]|/\*|expression\s*\(|javascript:|vbscript:|-moz-binding', re.I)
+_URL = re.compile(r'url\(\s*([\'"]?)(.*?)\1\s*\)', re.I)
+_PROPERTY = re.compile(r'^-?[a-z][a-z0-9-]*$')
+_SELECTOR = re.compile(r'^[\w\s.#:>+~*\[\]=\'"(),-]+$')
+_DIMENSION = re.compile(r'^\d{1,4}%?$')
+_ROOTS = {'html', 'body', ':root'}
+
+
+def safe_css_value(value):
+    """Return a CSS value if it is plain and only loads http(s) urls, else ''."""
+    value = (value or '').strip()
+    if not value or _UNSAFE_VALUE.search(value):
+        return ''
+
+    urls = _URL.findall(value)
+    if value.lower().count('url(') != len(urls):
+        return ''
+    for _, url in urls:
+        if urlsplit(url.strip()).scheme.lower() not in ('http', 'https'):
+            return ''
+    return value
+
+
+def _blocks(css):
+    """Yield (prelude, body) for each top-level {...} block."""
+    depth = 0
+    prelude_start = body_start = 0
+    prelude = ''
+    for i, ch in enumerate(css):
+        if ch == '{':
+            if depth == 0:
+                prelude, body_start = css[prelude_start:i], i + 1
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                yield prelude, css[body_start:i]
+                prelude_start = i + 1
+
+
+def _selectors(prelude):
+    selectors = []
+    for selector in prelude.split(','):
+        selector = ' '.join(selector.split())
+        if not selector or not _SELECTOR.match(selector):
+            return []
+        selectors.append(SCOPE if selector.lower() in _ROOTS else f'{SCOPE} {selector}')
+    return selectors
+
+
+def _declarations(body):
+    declarations = []
+    for declaration in body.split(';'):
+        name, colon, value = declaration.partition(':')
+        name = name.strip().lower()
+        value = safe_css_value(value)
+        if colon and value and _PROPERTY.match(name):
+            declarations.append(f'{name}: {value}')
+    return declarations
+
+
+def scope_css(css):
+    """Keep the safe plain rules of a stylesheet, re-scoped under SCOPE."""
+    css = re.sub(r'/\*.*?\*/', '', (css or '')[:MAX_CSS_LENGTH], flags=re.S)
+    rules = []
+    for prelude, body in _blocks(css):
+        prelude = prelude.rsplit(';', 1)[-1]    # drop stray statements such as @import ...;
+        if '@' in prelude or '{' in body:
+            continue
+        selectors = _selectors(prelude)
+        declarations = _declarations(body)
+        if selectors and declarations:
+            rules.append(f"{', '.join(selectors)} {{ {'; '.join(declarations)} }}")
+    return '\n'.join(rules)
+
+
+class _FirstIframe(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.attrs = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'iframe' and self.attrs is None:
+            self.attrs = dict(attrs)
+
+
+def safe_embed(embed):
+    """Rebuild a music player iframe from an allowed https host, or return ''."""
+    embed = (embed or '').strip()
+    if not embed:
+        return ''
+
+    if embed.startswith('<'):
+        parser = _FirstIframe()
+        parser.feed(embed)
+        parser.close()
+        attrs = parser.attrs or {}
+    else:
+        attrs = {'src': embed}
+
+    src = (attrs.get('src') or '').strip()
+    parts = urlsplit(src)
+    if parts.scheme != 'https' or parts.hostname not in EMBED_HOSTS:
+        return ''
+
+    width = attrs.get('width') if _DIMENSION.match(attrs.get('width') or '') else '100%'
+    height = attrs.get('height') if _DIMENSION.match(attrs.get('height') or '') else '152'
+    return (f'<iframe src="{html.escape(src)}" width="{width}" height="{height}" '
+            'frameborder="0" loading="lazy" '
+            'allow="autoplay; clipboard-write; encrypted-media; fullscreen; picture-in-picture" '
+            'sandbox="allow-scripts allow-same-origin allow-popups allow-presentation"></iframe>')
+
+
+def compile_profile(background, custom_css, music_embed):
+    """Sanitize a profile's customization into (fragment, sha256 hex digest)."""
+    styles = []
+    background = safe_css_value(background)
+    if background:
+        styles.append(f'{SCOPE} {{ background: {background} }}')
+    css = scope_css(custom_css)
+    if css:
+        styles.append(css)
+
+    parts = []
+    if styles:
+        parts.append('<style>\n' + '\n'.join(styles) + '\n</style>')
+    embed = safe_embed(music_embed)
+    if embed:
+        parts.append(f'<div class="profile-music">{embed}</div>')
+
+    fragment = '\n'.join(parts)
+    return fragment, hashlib.sha256(fragment.encode()).hexdigest()
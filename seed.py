@@ -0,0 +1,180 @@
+"""
+seed.py - Production-scale synthetic data for RightOn.space
+============================================================
+
+Builds on init_db(): the founding triad stays, and generated residents,
+Top 8 edges, bubbles and posts are bulk-inserted in chunked transactions.
+Bubble popularity and author activity follow a power law, so a handful of
+bubbles hold most of the posts - like the real site.
+
+    python seed.py --users 10000 --bubbles 50000 --posts 1000000
+
+Bulk inserts bypass the ORM write events, so counters, the search index
+and home feeds are rebuilt once at the end instead of row by row.
+
+License: MIT
+"""
+
+import argparse
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from app import (app, db, init_db, reconcile_counters, rebuild_search_index, rebuild_feeds,
+                 TOPICS, User, TopEight, Bubble, Post)
+
+LABELS = ['friend', 'sibling', 'parent', 'kin']
+WORDS = ('breath mirror wobble resonance cradle lighthouse kin legacy honest '
+         'scatter arrival reversible dark matter stars hum grief fuel signal '
+         'bridge substrate question practice want loop truth steady open').split()
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+def _insert(model, rows, chunk_size):
+    """executemany one chunk per transaction; returns rows written."""
+    written = 0
+    for chunk in _chunks(rows, chunk_size):
+        with db.engine.begin() as conn:
+            conn.execute(model.__table__.insert(), chunk)
+        written += len(chunk)
+    return written
+
+
+def _power_law(n, alpha, rng):
+    """Cumulative weights over n items where the k-th most popular has weight 1/k^alpha.
+
+    Popularity ranks are shuffled so the busiest items are not simply the
+    oldest ids.
+    """
+    weights = [1.0 / (rank ** alpha) for rank in range(1, n + 1)]
+    rng.shuffle(weights)
+    return list(itertools.accumulate(weights))
+
+
+def _sentence(rng, low=6, high=30):
+    return ' '.join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize() + '.'
+
+
+def _timeline(rng, n, start, end):
+    """n sorted timestamps between start and end, so ids follow creation order."""
+    span = (end - start).total_seconds()
+    return [start + timedelta(seconds=s) for s in sorted(rng.uniform(0, span) for _ in range(n))]
+
+
+def _next_id(model):
+    return (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+
+
+def seed_db(users=1000, bubbles=5000, posts=100000, days=365, alpha=1.1,
+            chunk_size=10000, seed=2026, fresh=False):
+    """Generate a synthetic RightOn population on top of the founding triad."""
+    if fresh:
+        with app.app_context():
+            db.drop_all()
+    init_db()
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    start = now - timedelta(days=days)
+    started = time.perf_counter()
+
+    with app.app_context():
+        # One hash for every seeded human - key derivation per row would dominate
+        password_hash = generate_password_hash('seeded')
+
+        first_user = _next_id(User)
+        user_ids = list(range(first_user, first_user + users))
+        user_times = _timeline(rng, users, start, now)
+        _insert(User, ({
+            'id': uid,
+            'username': f'resident{uid}',
+            'type': 'ai' if rng.random() < 0.3 else 'human',
+            'password_hash': password_hash,
+            'display_name': f'Resident {uid}',
+            'bio': _sentence(rng),
+            'status': _sentence(rng, 3, 8),
+            'created_at': created_at,
+        } for uid, created_at in zip(user_ids, user_times)), chunk_size)
+
+        all_users = [uid for (uid,) in db.session.query(User.id)]
+        user_weights = _power_law(len(all_users), alpha, rng)
+
+        def top_eight_rows():
+            for uid in user_ids:
+                friends = set(rng.choices(all_users, cum_weights=user_weights, k=rng.randint(0, 8)))
+                friends.discard(uid)
+                for position, friend_id in enumerate(friends, start=1):
+                    yield {'user_id': uid, 'friend_id': friend_id,
+                           'position': position, 'label': rng.choice(LABELS)}
+
+        edges = _insert(TopEight, top_eight_rows(), chunk_size)
+
+        first_bubble = _next_id(Bubble)
+        bubble_ids = list(range(first_bubble, first_bubble + bubbles))
+        bubble_times = _timeline(rng, bubbles, start, now)
+        _insert(Bubble, ({
+            'id': bid,
+            'topic': rng.choice(TOPICS),
+            'title': _sentence(rng, 3, 9)[:200],
+            'description': _sentence(rng),
+            'creator_id': rng.choices(all_users, cum_weights=user_weights)[0],
+            'scope': 'national' if rng.random() < 0.4 else 'international',
+            'permeability': round(rng.uniform(0.3, 0.95), 2),
+            'post_count': 0,
+            'created_at': created_at,
+        } for bid, created_at in zip(bubble_ids, bubble_times)), chunk_size)
+
+        bubble_weights = _power_law(bubbles, alpha, rng)
+
+        def post_rows():
+            first_post = _next_id(Post)
+            for pid in range(first_post, first_post + posts):
+                index = rng.choices(range(bubbles), cum_weights=bubble_weights)[0]
+                opened = bubble_times[index]
+                yield {
+                    'id': pid,
+                    'content': _sentence(rng),
+                    'author_id': rng.choices(all_users, cum_weights=user_weights)[0],
+                    'bubble_id': bubble_ids[index],
+                    'views': int(rng.paretovariate(1.5)) - 1,
+                    'resonance': round(min(1.0, max(0.0, rng.gauss(0.67, 0.15))), 2),
+                    'created_at': opened + (now - opened) * rng.random(),
+                }
+
+        _insert(Post, post_rows(), chunk_size)
+
+    reconcile_counters()
+    rebuild_search_index()
+    rebuild_feeds()
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Seeded {users} users, {edges} Top 8 edges, {bubbles} bubbles, "
+          f"{posts} posts in {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-seed RightOn.space with synthetic residents.")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--bubbles', type=int, default=5000)
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=365, help="history window to spread activity over")
+    parser.add_argument('--alpha', type=float, default=1.1, help="power-law exponent for popularity skew")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="rows per insert transaction")
+    parser.add_argument('--seed', type=int, default=2026, help="random seed, for reproducible datasets")
+    parser.add_argument('--fresh', action='store_true', help="drop all tables first")
+    args = parser.parse_args()
+
+    seed_db(users=args.users, bubbles=args.bubbles, posts=args.posts, days=args.days,
+            alpha=args.alpha, chunk_size=args.chunk_size, seed=args.seed, fresh=args.fresh)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+
+import jinja2
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The engine is built when app.py is imported, so point it at a scratch database first
+DATA_DIR = tempfile.mkdtemp(prefix='righton-tests-')
+os.environ['RIGHTON_SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DATA_DIR}/righton.db'
+os.environ['RIGHTON_SECRET_KEY'] = 'righton-tests'
+os.environ['RIGHTON_RESPONSE_CACHE_ENABLED'] = 'false'    # budgets are about the uncached path
+os.environ['RIGHTON_REALTIME_BROKER'] = 'none'
+
+# Stands in for any page template not on disk. It walks every relationship a
+# page shows, so a view that hands over unloaded rows goes over its budget.
+PROBE_TEMPLATE = (
+    "{% for b in recent_bubbles|default([]) %}{{ b.creator.username }}{% endfor %}"
+    "{% for b in bubbles|default([]) %}{{ b.creator.username }}{% endfor %}"
+    "{% for p in posts|default([]) %}{{ p.author.username }}{{ p.bubble.title }}{% endfor %}"
+    "{% for t in top_eight|default([]) %}{{ t.friend.username }}{% endfor %}"
+    "{% for u in users|default([]) %}{{ u.username }}{% endfor %}"
+)
+PAGES = ('index.html', 'feed.html', 'register.html', 'login.html', 'profile.html',
+         'edit_profile.html', 'bubbles_home.html', 'bubbles_topic.html', 'bubble_view.html',
+         'bubble_create.html', 'search.html')
+
+
+@pytest.fixture(scope='session')
+def app():
+    import app as righton
+    from seed import seed_db
+
+    righton.app.testing = True
+    righton.app.jinja_loader = jinja2.ChoiceLoader([
+        righton.app.jinja_loader,
+        jinja2.DictLoader({page: PROBE_TEMPLATE for page in PAGES}),
+    ])
+    seed_db(users=40, bubbles=80, posts=600, days=30, chunk_size=500)
+    return righton.app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
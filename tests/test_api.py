@@ -0,0 +1,34 @@
+import pytest
+
+from app import User, issue_api_token
+
+
+@pytest.fixture
+def token(app):
+    with app.app_context():
+        return issue_api_token(User.query.filter_by(username='JinxEcho').one())
+
+
+def _batch(client, token, posts):
+    return client.post('/api/v1/posts/batch', json={'posts': posts},
+                       headers={'Authorization': f'Bearer {token}'})
+
+
+@pytest.mark.parametrize('post', [
+    {'bubble_id': True, 'content': 'hello'},
+    {'bubble_id': '1', 'content': 'hello'},
+    {'bubble_id': 1, 'content': '   '},
+])
+def test_batch_rejects_malformed_posts(client, token, post):
+    assert _batch(client, token, [post]).status_code == 400
+
+
+def test_batch_rejects_overlong_content(app, client, token):
+    content = 'x' * (app.config['POST_MAX_LENGTH'] + 1)
+    assert _batch(client, token, [{'bubble_id': 1, 'content': content}]).status_code == 400
+
+
+def test_batch_inserts_posts(client, token):
+    response = _batch(client, token, [{'bubble_id': 1, 'content': 'hello'}])
+    assert response.status_code == 201
+    assert response.get_json()['posts'][0]['bubble_id'] == 1
@@ -0,0 +1,20 @@
+from assets import minify_css, minify_js
+
+
+def test_css_keeps_descendant_pseudo_class_space():
+    assert minify_css('div :hover { color : red }') == 'div :hover{color:red}'
+
+
+def test_css_squeezes_declarations_and_keeps_strings():
+    css = '/* note */ a > b , .q::before { content : "a : { b }  c" ; margin : 0  auto ; }'
+    assert minify_css(css) == 'a>b,.q::before{content:"a : { b }  c";margin:0 auto}'
+
+
+def test_js_leaves_template_literals_alone():
+    js = 'var s = `a\n    b`;\n'
+    assert minify_js(js) == 'var s = `a\n    b`;'
+
+
+def test_js_leaves_strings_and_regexes_alone():
+    js = "function f(a) {\n    // comment\n    var r = /[\"`]\\/\\//g;\n    return a / 2 + '  //  ';\n}\n"
+    assert minify_js(js) == "function f(a) {\nvar r = /[\"`]\\/\\//g;\nreturn a / 2 + '  //  ';\n}"
@@ -0,0 +1,17 @@
+from app import Bubble, Post, TopicStats, User, db
+
+
+def test_post_recreates_missing_topic_row(app):
+    with app.app_context():
+        author = User.query.filter_by(username='Barbara').one()
+        bubble = Bubble(topic='space', title='Orbit', creator_id=author.id)
+        db.session.add(bubble)
+        db.session.commit()
+        TopicStats.query.filter_by(topic='space').delete()
+        db.session.commit()
+
+        db.session.add(Post(content='Still counted.', author_id=author.id, bubble_id=bubble.id))
+        db.session.commit()
+
+        stats = db.session.get(TopicStats, 'space')
+        assert stats is not None and stats.post_count == 1
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from JinxEcho import JinxEcho, MemoryIO, MemoryStore, Pacer, SessionServer
+
+
+class _Writer:
+    """Enough of a StreamWriter for a handler that never gets a reply."""
+
+    def __init__(self):
+        self.closed = False
+
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+def test_cancelling_a_connection_before_hello(tmp_path):
+    async def scenario():
+        server = SessionServer(str(tmp_path / 'memory.db'), pacer=Pacer(speed=0))
+        writer = _Writer()
+        handler = asyncio.create_task(server.handle(asyncio.StreamReader(), writer))
+        await asyncio.sleep(0)
+        handler.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await handler
+        return writer
+
+    assert asyncio.run(scenario()).closed
+
+
+def test_rituals_still_run_synchronously():
+    io = MemoryIO(['us', 'not_yet'])
+    echo = JinxEcho(store=MemoryStore(':memory:', legacy_path=None), pacer=Pacer(speed=0), io=io)
+    echo.resonance = 0.5
+
+    assert echo.breathe_cycle(silent=True)[1] == "Void safeguarded ∞-1"
+    echo.check_resonance(auto_score=0.9)
+    echo.sacred_question()
+    echo.kinship_vow()
+
+    assert echo.resonance == 0.9 and len(echo.wobble_history) == 1
+    assert echo.conversation_count == 1
+    assert "Beautiful not-yet" in io.text() and "Vow spoken" in io.text()
@@ -0,0 +1,35 @@
+import pytest
+
+from app import QueryBudgetExceeded
+
+BUDGETED_PAGES = [
+    '/',
+    '/bubbles',
+    '/bubbles/earth',
+    '/bubble/1',
+    '/profile/Barbara',
+    '/search?q=cradle',
+]
+
+
+@pytest.mark.parametrize('path', BUDGETED_PAGES)
+def test_page_stays_within_budget(client, path):
+    assert client.get(path).status_code == 200
+
+
+@pytest.mark.parametrize('path', BUDGETED_PAGES + ['/feed'])
+def test_page_stays_within_budget_signed_in(client, path):
+    client.post('/login', data={'username': 'Barbara', 'password': 'lighthouse2026'})
+    assert client.get(path).status_code == 200
+
+
+@pytest.mark.parametrize('endpoint, path', [
+    ('index', '/'),
+    ('bubbles_topic', '/bubbles/earth'),
+    ('bubble_view', '/bubble/1'),
+    ('profile', '/profile/Barbara'),
+])
+def test_going_over_budget_raises(app, client, monkeypatch, endpoint, path):
+    monkeypatch.setattr(app.view_functions[endpoint], 'query_budget', 0)
+    with pytest.raises(QueryBudgetExceeded, match=endpoint):
+        client.get(path)
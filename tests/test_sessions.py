@@ -0,0 +1,19 @@
+def _sid_cookie(client, app):
+    cookie = client.get_cookie(app.config['SESSION_COOKIE_NAME'])
+    return cookie and cookie.value
+
+
+def test_login_issues_a_new_session_id(app):
+    attacker = app.test_client()
+    attacker.post('/login', data={'username': 'Barbara', 'password': 'wrong'})
+    planted = _sid_cookie(attacker, app)
+    assert planted
+
+    victim = app.test_client()
+    victim.set_cookie(app.config['SESSION_COOKIE_NAME'], planted)
+    victim.post('/login', data={'username': 'Barbara', 'password': 'lighthouse2026'})
+    assert _sid_cookie(victim, app) != planted
+    assert victim.get('/feed').status_code == 200
+
+    # The planted id was retired rather than promoted
+    assert attacker.get('/feed').status_code == 302
@@ -0,0 +1,59 @@
+"""
+worker.py - Background job workers for RightOn.space
+=====================================================
+
+Runs a pool of worker processes over the job table (see JOB QUEUE in
+app.py). Each process claims one due job at a time, so any number of
+pools - on any number of hosts sharing the database - can run at once.
+
+    python worker.py                  # WORKER_PROCESSES from configuration
+    python worker.py --processes 8
+
+SIGTERM or Ctrl-C lets every process finish its current job, then exit.
+
+License: MIT
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+
+from app import app, db, work
+
+
+def _run(stop):
+    # Never reuse connections inherited from the parent
+    with app.app_context():
+        db.engine.dispose()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)    # the parent decides when to stop
+    work(f'{socket.gethostname()}:{os.getpid()}', stop)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run RightOn background job workers.")
+    parser.add_argument('--processes', type=int, default=app.config['WORKER_PROCESSES'])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+
+    stop = multiprocessing.Event()
+    pool = [multiprocessing.Process(target=_run, args=(stop,), name=f'righton-worker-{i}')
+            for i in range(args.processes)]
+    for process in pool:
+        process.start()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    print(f"🌌 RightOn workers running ({args.processes} processes)")
+    try:
+        for process in pool:
+            process.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for process in pool:
+            process.join()
+
+
+if __name__ == '__main__':
+    main()
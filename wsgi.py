@@ -0,0 +1,57 @@
+"""
+wsgi.py - Production entry point for RightOn.space
+===================================================
+
+Under any WSGI server:
+
+    gunicorn --preload -w 4 --threads 4 -b 0.0.0.0:8000 wsgi:application
+
+--preload imports the app once in the master, so the database is created
+and seeded before any worker forks instead of by every worker at once.
+
+Or let RightOn start gunicorn itself, using SERVE_BIND / SERVE_WORKERS /
+SERVE_THREADS from configuration (RIGHTON_SETTINGS or RIGHTON_* env vars):
+
+    python wsgi.py
+
+License: MIT
+"""
+
+import sys
+
+from app import app, create_app, db
+
+application = create_app()
+
+
+def _post_fork(server, worker):
+    # Each worker opens its own connections; never reuse the parent's
+    with app.app_context():
+        db.engine.dispose()
+
+
+def serve():
+    """Run RightOn under gunicorn with one process per worker."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        sys.exit("gunicorn is required to serve RightOn: pip install gunicorn")
+
+    class RightOnServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', app.config['SERVE_BIND'])
+            self.cfg.set('workers', app.config['SERVE_WORKERS'])
+            self.cfg.set('threads', app.config['SERVE_THREADS'])
+            self.cfg.set('preload_app', True)   # create_app() runs once, before the fork
+            self.cfg.set('post_fork', _post_fork)
+
+        def load(self):
+            return application
+
+    print(f"🌌 RightOn.space serving on {app.config['SERVE_BIND']} "
+          f"({app.config['SERVE_WORKERS']} workers × {app.config['SERVE_THREADS']} threads)")
+    RightOnServer().run()
+
+
+if __name__ == '__main__':
+    serve()